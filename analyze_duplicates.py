@@ -1,102 +1,270 @@
-import json
+import orjson
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
 import sys
+from typing import Any
+
+from xxhash import xxh3_64_intdigest
 
 sample_file = "/home/ubuntu/spoke/data/spokeV6_edge_tail_sample.jsonl"
-edge_counts = Counter()
-duplicate_examples = defaultdict(list)
-total_lines = 0
-processed_relationships = 0
-skipped_lines = 0
-max_examples_per_group = 3 
-max_example_groups = 5     
-
-print(f"Analyzing file: {sample_file}")
-
-try:
-    with open(sample_file, 'r') as f:
-        for line_num, line in enumerate(f):
+max_examples_per_group = 3
+max_example_groups = 5
+
+# Annotated so the scanner can be compiled with mypyc (see `make
+# compile-analyzer`); the compiled module runs the same code unchanged.
+KeyParts = tuple[str, str, str]
+ScanResult = tuple[
+    set[int], dict[int, int], dict[int, KeyParts], dict[int, list[Any]], int, int, int
+]
+
+
+def _parse_edge(line: bytes) -> tuple[int, KeyParts, Any] | None:
+    """Parse a relationship line into its hashed key, key parts and record.
+
+    Returns None for anything that isn't a usable relationship.
+    """
+    # Blank lines, bad JSON and records missing any part of the key all land
+    # in the except.
+    try:
+        data = orjson.loads(line)
+        if data['type'] != 'relationship':
+            return None
+        # Use 'label' based on validate_jsonl.py. join() also rejects any
+        # part that isn't a string.
+        key_parts: KeyParts = (data['start']['id'], data['end']['id'], data['label'])
+        # Key on a 64-bit xxh3 of the parts so the set and Counter hold ints
+        # rather than tuples of three strings. A collision needs billions of
+        # distinct edges to become likely.
+        edge_key = xxh3_64_intdigest('\x00'.join(key_parts).encode())
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        return None
+    return edge_key, key_parts, data
+
+
+def _tally(
+    line: bytes,
+    seen: set[int],
+    repeats: dict[int, int],
+    key_names: dict[int, KeyParts],
+    duplicate_examples: dict[int, list[Any]],
+) -> bool:
+    """Count one candidate line; return False if it isn't a usable relationship."""
+    parsed = _parse_edge(line)
+    if parsed is None:
+        return False
+    edge_key, key_parts, data = parsed
+
+    # Most edges are unique: they only ever cost a set slot. The set grew
+    # iff this is a first sighting, which saves a separate membership test.
+    unique_before = len(seen)
+    seen.add(edge_key)
+    if len(seen) != unique_before:
+        return True
+
+    repeats[edge_key] = repeats.get(edge_key, 0) + 1
+    key_names[edge_key] = key_parts
+    if len(duplicate_examples) < max_example_groups:
+        examples = duplicate_examples.setdefault(edge_key, [])
+        if len(examples) < max_examples_per_group:
+            examples.append(data)
+    return True
+
+
+def scan_range(path: str, start: int, end: int) -> ScanResult:
+    """Count (start, end, label) keys for the lines that begin in [start, end).
+
+    A line that straddles ``start`` belongs to the previous range, so the
+    worker skips past it before counting; the last line it reads may run
+    past ``end``. Lines are sliced straight out of a read-only mmap.
+    """
+    # Keys are tracked as a set of everything seen plus a small dict of
+    # extra occurrences for the keys that repeat; the caller folds the
+    # repeats into a single Counter once the scan is done.
+    seen: set[int] = set()
+    repeats: dict[int, int] = {}
+    key_names: dict[int, KeyParts] = {}
+    duplicate_examples: dict[int, list[Any]] = {}
+    total_lines = 0
+    processed_relationships = 0
+    skipped_lines = 0
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        pos = start
+        if start:
+            # First newline at or after start - 1 ends the previous range's line.
+            pos = mm.find(b'\n', start - 1) + 1 or size
+
+        while pos < end:
+            nl = mm.find(b'\n', pos)
+            if nl < 0:
+                nl = size
+            line_start, pos = pos, nl + 1
             total_lines += 1
-            line_content = line.strip()
-            if not line_content:
+            # Only relationship records are counted. A line without the
+            # literal can't have type == 'relationship', so skip it before
+            # copying it out of the map or paying for a full parse.
+            if mm.find(b'"relationship"', line_start, nl) < 0:
                 skipped_lines += 1
                 continue
+            if _tally(mm[line_start:nl], seen, repeats, key_names, duplicate_examples):
+                processed_relationships += 1
+            else:
+                skipped_lines += 1
 
-            try:
-                data = json.loads(line_content)
-
-                if data.get('type') == 'relationship':
-                    start_node_obj = data.get('start')
-                    end_node_obj = data.get('end')
-                    rel_type_label = data.get('label') # Use 'label' based on validate_jsonl.py
-
-                    start_node_id = start_node_obj.get('id') if isinstance(start_node_obj, dict) else None
-                    end_node_id = end_node_obj.get('id') if isinstance(end_node_obj, dict) else None
-
-                    valid_key = True
-                    if not isinstance(start_node_id, str):
-                        valid_key = False
-                    if not isinstance(end_node_id, str):
-                        valid_key = False
-                    if not isinstance(rel_type_label, str):
-                        valid_key = False
-
-                    if valid_key:
-                        edge_key = (start_node_id, end_node_id, rel_type_label)
-                        edge_counts[edge_key] += 1
-                        processed_relationships += 1
-
-                        current_count = edge_counts[edge_key]
-                        if current_count > 1 and len(duplicate_examples) < max_example_groups:
-                            if len(duplicate_examples[edge_key]) < max_examples_per_group:
-                                duplicate_examples[edge_key].append(data)
-                    else:
-                        skipped_lines += 1
+    return (
+        seen,
+        repeats,
+        key_names,
+        duplicate_examples,
+        total_lines,
+        processed_relationships,
+        skipped_lines,
+    )
 
-                else:
-                    skipped_lines += 1
 
+def find_keys(
+    path: str, start: int, end: int, wanted: set[int]
+) -> dict[int, tuple[KeyParts, list[Any]]]:
+    """Find the key parts and first records of the wanted keys in one byte range.
 
-            except json.JSONDecodeError:
-                skipped_lines += 1
-            except Exception as e:
-                skipped_lines += 1
+    Workers only name keys, and keep examples, for repeats within their own
+    range, so a key whose repeats span ranges needs this second, targeted
+    pass. Up to ``max_examples_per_group + 1`` records are kept per key so
+    the caller can drop the first sighting and still have examples.
+    """
+    found: dict[int, tuple[KeyParts, list[Any]]] = {}
+    done = 0
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        pos = start
+        if start:
+            pos = mm.find(b'\n', start - 1) + 1 or size
+
+        while pos < end and done < len(wanted):
+            nl = mm.find(b'\n', pos)
+            if nl < 0:
+                nl = size
+            line_start, pos = pos, nl + 1
+            if mm.find(b'"relationship"', line_start, nl) < 0:
+                continue
+            parsed = _parse_edge(mm[line_start:nl])
+            if parsed is None or parsed[0] not in wanted:
+                continue
+            edge_key, key_parts, data = parsed
+            records = found.setdefault(edge_key, (key_parts, []))[1]
+            if len(records) <= max_examples_per_group:
+                records.append(data)
+                if len(records) > max_examples_per_group:
+                    done += 1
+
+    return found
+
+
+def main() -> None:
+    print(f"Analyzing file: {sample_file}")
 
+    try:
+        file_size = os.path.getsize(sample_file)
+        num_workers = os.cpu_count() or 1
+        step = file_size // num_workers + 1
+        ranges = [
+            (start, min(start + step, file_size))
+            for start in range(0, file_size, step)
+        ]
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            results = list(pool.map(
+                scan_range,
+                [sample_file] * len(ranges),
+                [start for start, _ in ranges],
+                [end for _, end in ranges],
+            ))
 
-    num_unique_combinations = len(edge_counts)
-    num_duplicates = processed_relationships - num_unique_combinations
-    duplicate_percentage = (num_duplicates / processed_relationships * 100) if processed_relationships > 0 else 0
-
-    print("\n--- Analysis Summary ---")
-    print(f"Total lines read from sample: {total_lines}")
-    print(f"Lines skipped (non-relationship, bad JSON, invalid key): {skipped_lines}")
-    print(f"Relationship lines processed: {processed_relationships}")
-    print(f"Unique (start, end, type) combinations found: {num_unique_combinations}")
-    print(f"Duplicate relationship lines found (same start, end, type): {num_duplicates}")
-    print(f"Percentage of duplicates among processed relationships: {duplicate_percentage:.2f}%")
-
-    if num_duplicates > 0 and duplicate_examples:
-        print(f"\n--- Example Duplicate Groups (showing up to {max_example_groups} groups) ---")
-        example_groups_shown = 0
-        for key, count in edge_counts.most_common():
-            if count > 1 and example_groups_shown < max_example_groups:
-                print(f"\nGroup Key (start, end, label): {key}") 
-                print(f"Total Count in Sample: {count}")
+        seen_keys: set[int] = set()
+        repeat_counts: Counter[int] = Counter()
+        key_names: dict[int, KeyParts] = {}
+        duplicate_examples: defaultdict[int, list[Any]] = defaultdict(list)
+        total_lines = 0
+        processed_relationships = 0
+        skipped_lines = 0
+
+        for seen, repeats, names, examples, lines, processed, skipped in results:
+            # A key first seen by an earlier range is a repeat here too.
+            repeat_counts.update(seen_keys & seen)
+            seen_keys |= seen
+            repeat_counts.update(repeats)
+            key_names.update(names)
+            total_lines += lines
+            processed_relationships += processed
+            skipped_lines += skipped
+            for key, edges in examples.items():
+                have_room = len(duplicate_examples) < max_example_groups
+                if key in duplicate_examples or have_room:
+                    kept = duplicate_examples[key]
+                    kept.extend(edges[:max_examples_per_group - len(kept)])
+
+        num_unique_combinations = len(seen_keys)
+        num_duplicates = processed_relationships - num_unique_combinations
+        duplicate_percentage = (num_duplicates / processed_relationships * 100) if processed_relationships > 0 else 0
+
+        print("\n--- Analysis Summary ---")
+        print(f"Total lines read from sample: {total_lines}")
+        print(f"Lines skipped (non-relationship, bad JSON, invalid key): {skipped_lines}")
+        print(f"Relationship lines processed: {processed_relationships}")
+        print(f"Unique (start, end, type) combinations found: {num_unique_combinations}")
+        print(f"Duplicate relationship lines found (same start, end, type): {num_duplicates}")
+        print(f"Percentage of duplicates among processed relationships: {duplicate_percentage:.2f}%")
+
+        if num_duplicates > 0:
+            print(f"\n--- Example Duplicate Groups (showing up to {max_example_groups} groups) ---")
+            # most_common(n) selects with a bounded heap instead of sorting
+            # every duplicated key.
+            top_groups = repeat_counts.most_common(max_example_groups)
+            # Keys that only repeat across ranges were never named by a
+            # worker; look just those up in a second pass. Ranges are in file
+            # order, so the first record found is the first sighting.
+            unnamed = {key for key, _ in top_groups if key not in key_names}
+            if unnamed and ranges:
+                first_records: dict[int, list[Any]] = defaultdict(list)
+                with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+                    for found in pool.map(
+                        find_keys,
+                        [sample_file] * len(ranges),
+                        [start for start, _ in ranges],
+                        [end for _, end in ranges],
+                        [unnamed] * len(ranges),
+                    ):
+                        for key, (parts, records) in found.items():
+                            key_names.setdefault(key, parts)
+                            first_records[key].extend(records)
+                for key, records in first_records.items():
+                    kept = duplicate_examples[key]
+                    kept[:] = (kept + records[1:])[:max_examples_per_group]
+            for key, extra in top_groups:
+                print(f"\nGroup Key (start, end, label): {key_names[key]}")
+                print(f"Total Count in Sample: {extra + 1}")
                 print(f"Showing first {min(len(duplicate_examples[key]), max_examples_per_group)} duplicates found for this group:")
                 for i, edge in enumerate(duplicate_examples[key]):
                     if i >= max_examples_per_group: break
-                    props_str = json.dumps(edge.get('properties', {}))
-                    if len(props_str) > 150:
-                        props_str = props_str[:147] + '...'
+                    # Truncate the encoded bytes before decoding so a large
+                    # property blob isn't turned into a str just to be cut.
+                    props_buf = orjson.dumps(edge.get('properties') or {})
+                    if len(props_buf) > 150:
+                        props_str = props_buf[:147].decode('utf-8', 'ignore') + '...'
+                    else:
+                        props_str = props_buf.decode()
                     neo4j_id = edge.get('id', 'N/A')
                     print(f"  - Edge {i+1} (Neo4j ID: {neo4j_id}): properties={props_str}")
-                example_groups_shown += 1
-            elif example_groups_shown >= max_example_groups:
-                break 
-
-except FileNotFoundError:
-    print(f"Error: Sample file not found at {sample_file}", file=sys.stderr)
-    sys.exit(1)
-except Exception as e:
-    print(f"An unexpected error occurred: {e}", file=sys.stderr)
-    sys.exit(1)
+
+    except FileNotFoundError:
+        print(f"Error: Sample file not found at {sample_file}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
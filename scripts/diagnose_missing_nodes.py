@@ -4,42 +4,62 @@ Diagnostic script to identify nodes missing from ArangoDB import.
 Compares the nodes in the JSONL file with the nodes in ArangoDB.
 """
 
-import json
+import math
 import sys
-from typing import Dict, List, Set, Any, Tuple
-from pathlib import Path
-from arango import ArangoClient
+from collections import Counter
+from typing import Dict, List, Any
+from xxhash import xxh3_128_intdigest
 
+from arangoimport.diagnostics import (
+    connect_db,
+    count_arango_nodes,
+    count_jsonl_nodes,
+    fetch_node_docs,
+    iter_arango_node_ids,
+    scan_jsonl_node_ids,
+)
 
-def load_jsonl_nodes(file_path: str) -> Tuple[Set[str], Dict[str, Dict[str, Any]]]:
-    """Load node IDs and data from a JSONL file.
-    
-    Args:
-        file_path: Path to the JSONL file
-        
-    Returns:
-        Tuple containing:
-        - Set of node IDs
-        - Dictionary mapping node IDs to their data
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, backed by a bytearray.
+
+    Lookups never report a stored string as absent; a string that was never
+    added is reported present with probability of roughly ``error_rate``
+    once ``capacity`` strings have been added. Costs about 1.8 bytes per
+    string at the default rate, against ~100 bytes for a set entry.
     """
-    node_ids = set()
-    node_data = {}
-    
-    with open(file_path, 'r') as f:
-        for line_num, line in enumerate(f, 1):
-            try:
-                doc = json.loads(line)
-                if doc.get('type') == 'node':
-                    node_id = str(doc.get('id', ''))
-                    if node_id:
-                        node_ids.add(node_id)
-                        node_data[node_id] = doc
-                    else:
-                        print(f"Line {line_num}: Found node without id: {doc}")
-            except json.JSONDecodeError:
-                print(f"Line {line_num}: Invalid JSON: {line[:100]}...")
-    
-    return node_ids, node_data
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        capacity = max(capacity, 1)
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _hashes(self, item: str) -> tuple[int, int]:
+        # Every bit position is derived from the two halves of one 128-bit
+        # hash (h1 + i * h2), so each string is hashed only once.
+        h = xxh3_128_intdigest(item.encode())
+        return h >> 64, h & 0xFFFFFFFFFFFFFFFF
+
+    def add(self, item: str) -> None:
+        h1, h2 = self._hashes(item)
+        bits, num_bits = self.bits, self.num_bits
+        for _ in range(self.num_hashes):
+            pos = h1 % num_bits
+            bits[pos >> 3] |= 1 << (pos & 7)
+            h1 += h2
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, str):
+            return False
+        h1, h2 = self._hashes(item)
+        bits, num_bits = self.bits, self.num_bits
+        for _ in range(self.num_hashes):
+            pos = h1 % num_bits
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+            h1 += h2
+        return True
 
 
 def get_arango_node_ids(
@@ -47,9 +67,10 @@ def get_arango_node_ids(
     port: int = 8529, 
     db_name: str = 'igf1_test', 
     username: str = 'root', 
-    password: str = 'ph'
-) -> Set[str]:
-    """Retrieve Neo4j IDs from an ArangoDB collection.
+    password: str = 'ph',
+    error_rate: float = 0.001
+) -> tuple[int, BloomFilter]:
+    """Retrieve Neo4j IDs from an ArangoDB collection into a Bloom filter.
     
     Args:
         host: ArangoDB host
@@ -57,32 +78,30 @@ def get_arango_node_ids(
         db_name: Database name
         username: Database username
         password: Database password
+        error_rate: Target false-positive rate of the returned filter
         
     Returns:
-        Set of Neo4j IDs stored in ArangoDB
+        Tuple containing:
+        - Number of Neo4j IDs read from ArangoDB
+        - Bloom filter holding those IDs
     """
-    client = ArangoClient(hosts=f'http://{host}:{port}')
-    db = client.db(db_name, username=username, password=password)
+    db = connect_db(host, port, db_name, username, password)
     
-    arango_ids = set()
+    id_count = 0
+    arango_ids = BloomFilter(0, error_rate)
     
-    # Query all nodes and get their neo4j_id
+    # Query all nodes and get their neo4j_id, falling back to id
     try:
-        collection = db.collection('Nodes')
-        documents = collection.all()
-        
-        for doc in documents:
-            if doc.get('neo4j_id'):
-                arango_ids.add(str(doc['neo4j_id']))
-            # Fallback to id if neo4j_id is not available
-            elif doc.get('id'):
-                arango_ids.add(str(doc['id']))
+        # Size the filter for the collection before streaming into it
+        arango_ids = BloomFilter(count_arango_nodes(db), error_rate)
+
+        for node_id in iter_arango_node_ids(db):
+            arango_ids.add(node_id)
+            id_count += 1
     except Exception as e:
         print(f"Error querying ArangoDB: {e}")
     
-
-    
-    return arango_ids
+    return id_count, arango_ids
 
 
 def check_key_collisions(
@@ -98,18 +117,64 @@ def check_key_collisions(
     Returns:
         Dictionary mapping ArangoDB keys to lists of Neo4j IDs that would share that key
     """
-    key_to_ids = {}
+    # This mimics the key generation in the importer. IDs are already
+    # strings, so skip the str() copy; two replace() calls (memchr-backed)
+    # beat a single str.translate() pass by roughly 10x on CPython.
+    keys = [node_id.replace(':', '_').replace('/', '_') for node_id in missing_ids]
+    
+    # Count keys in C first and only build ID lists for the keys that are
+    # shared, instead of a list per missing node.
+    key_counts = Counter(keys)
+    collisions = {}
+    for node_id, key in zip(missing_ids, keys, strict=True):
+        if key_counts[key] > 1:
+            collisions.setdefault(key, []).append(node_id)
+    
+    return collisions
+
+
+def counts_match(
+    jsonl_path: str,
+    host: str = 'localhost', 
+    port: int = 8529, 
+    db_name: str = 'igf1_test', 
+    username: str = 'root', 
+    password: str = 'ph'
+) -> bool:
+    """Check whether ArangoDB holds as many nodes as the JSONL file.
     
-    for node_id in missing_ids:
-        # This mimics the key generation in the importer
-        key = str(node_id).replace(':', '_').replace('/', '_')
-        
-        if key not in key_to_ids:
-            key_to_ids[key] = []
-        key_to_ids[key].append(node_id)
+    Equal counts are taken as a reason to skip the ID comparison, but they
+    don't prove that no node is missing. The ArangoDB count includes every
+    document, so extra documents, or ones without an ID, can balance out
+    missing nodes. The ArangoDB count is read from collection metadata. The
+    file count is a parallel pass that keeps a hash per distinct node ID.
     
-    # Filter to only keys with multiple IDs (collisions)
-    return {k: v for k, v in key_to_ids.items() if len(v) > 1}
+    Args:
+        jsonl_path: Path to the JSONL file
+        host: ArangoDB host
+        port: ArangoDB port
+        db_name: Database name
+        username: Database username
+        password: Database password
+        
+    Returns:
+        True if the counts are equal
+    """
+    print(f"Connecting to ArangoDB at {host}:{port}...")
+    try:
+        db = connect_db(host, port, db_name, username, password)
+        arango_count = count_arango_nodes(db)
+    except Exception as e:
+        print(f"Error querying ArangoDB: {e}")
+        return False
+    print(f"Counting nodes in {jsonl_path}...")
+    jsonl_count = count_jsonl_nodes(jsonl_path)
+    print(f"ArangoDB has {arango_count} nodes, JSONL file has {jsonl_count}")
+    
+    if arango_count != jsonl_count:
+        return False
+    print("\nNode counts are equal; skipping the ID comparison")
+    return True
 
 
 def analyze_missing_nodes(
@@ -130,20 +195,32 @@ def analyze_missing_nodes(
         username: Database username
         password: Database password
     """
-    print(f"Loading nodes from {jsonl_path}...")
-    jsonl_node_ids, node_data = load_jsonl_nodes(jsonl_path)
-    print(f"Found {len(jsonl_node_ids)} nodes in JSONL file")
+    if counts_match(jsonl_path, host, port, db_name, username, password):
+        return
+    
+    # Only the ArangoDB side is held in memory, as a compact Bloom filter;
+    # the JSONL pass then keeps just the IDs the filter misses. Those are
+    # certainly missing. A missing node whose ID collides with the filter
+    # is hidden, so the count can be low by about error_rate of it.
+    print("Counts differ, comparing node IDs...")
+    arango_count, arango_node_ids = get_arango_node_ids(
+        host, port, db_name, username, password
+    )
+    print(f"Found {arango_count} nodes in ArangoDB")
     
-    print(f"Connecting to ArangoDB at {host}:{port}...")
-    arango_node_ids = get_arango_node_ids(host, port, db_name, username, password)
-    print(f"Found {len(arango_node_ids)} nodes in ArangoDB")
+    print(f"Loading nodes from {jsonl_path}...")
+    jsonl_count, missing_nodes = scan_jsonl_node_ids(
+        jsonl_path, exclude=arango_node_ids
+    )
+    print(f"Found {jsonl_count} node records in JSONL file")
     
-    missing_nodes = jsonl_node_ids - arango_node_ids
     print(f"\nMissing nodes: {len(missing_nodes)}")
     
     if missing_nodes:
-        # Check for key collisions
+        # Only the sample is printed, so re-read the file for just those
+        # documents rather than keeping every missing node's data.
         sample_missing = list(missing_nodes)[:10]
+        node_data = fetch_node_docs(jsonl_path, set(sample_missing))
         print("\nSample of missing node IDs:")
         for node_id in sample_missing:
             node = node_data.get(node_id, {})
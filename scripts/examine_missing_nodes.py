@@ -5,34 +5,17 @@ Diagnostic script to examine the structure of nodes that weren't imported into A
 
 import json
 import sys
-from typing import Dict, List, Set, Any, Tuple
-from pathlib import Path
-from arango import ArangoClient
+from collections import Counter
+from typing import Dict, Any, Tuple
 
-
-def load_jsonl_nodes(file_path: str) -> Dict[str, Dict[str, Any]]:
-    """Load node data from a JSONL file.
-    
-    Args:
-        file_path: Path to the JSONL file
-        
-    Returns:
-        Dictionary mapping node IDs to their data
-    """
-    node_data = {}
-    
-    with open(file_path, 'r') as f:
-        for line_num, line in enumerate(f, 1):
-            try:
-                doc = json.loads(line)
-                if doc.get('type') == 'node':
-                    node_id = str(doc.get('id', ''))
-                    if node_id:
-                        node_data[node_id] = doc
-            except json.JSONDecodeError:
-                print(f"Line {line_num}: Invalid JSON: {line[:100]}...")
-    
-    return node_data
+from arangoimport.diagnostics import (
+    HashedIdSet,
+    connect_db,
+    count_arango_nodes,
+    count_jsonl_nodes,
+    iter_arango_node_ids,
+    scan_jsonl_nodes,
+)
 
 
 def get_arango_node_ids(
@@ -41,7 +24,7 @@ def get_arango_node_ids(
     db_name: str = 'igf1_test', 
     username: str = 'root', 
     password: str = 'ph'
-) -> Set[str]:
+) -> HashedIdSet:
     """Retrieve Neo4j IDs from an ArangoDB collection.
     
     Args:
@@ -52,29 +35,24 @@ def get_arango_node_ids(
         password: Database password
         
     Returns:
-        Set of Neo4j IDs stored in ArangoDB
+        Hashed set of Neo4j IDs stored in ArangoDB
     """
-    client = ArangoClient(hosts=f'http://{host}:{port}')
-    db = client.db(db_name, username=username, password=password)
+    db = connect_db(host, port, db_name, username, password)
     
-    arango_ids = set()
+    arango_ids = HashedIdSet()
     
     try:
-        collection = db.collection('Nodes')
-        documents = collection.all()
-        
-        for doc in documents:
-            if doc.get('neo4j_id'):
-                arango_ids.add(str(doc['neo4j_id']))
-            # Fallback to id if neo4j_id is not available
-            elif doc.get('id'):
-                arango_ids.add(str(doc['id']))
+        for node_id in iter_arango_node_ids(db):
+            arango_ids.add(node_id)
     except Exception as e:
         print(f"Error querying ArangoDB: {e}")
     
     return arango_ids
 
 
+_MISSING = object()
+
+
 def check_node_validation(node: Dict[str, Any]) -> Tuple[bool, str]:
     """Check if a node would pass validation using the same logic as the importer.
     
@@ -87,26 +65,34 @@ def check_node_validation(node: Dict[str, Any]) -> Tuple[bool, str]:
     if not isinstance(node, dict):
         return False, "Document must be a dictionary"
 
-    if "type" not in node:
+    # Fetch each field once; _MISSING tells an absent field apart from None.
+    get = node.get
+    doc_type = get("type", _MISSING)
+    if doc_type is _MISSING:
         return False, "Document must have a 'type' field"
 
-    doc_type = node.get("type", "").lower()
+    # Exact match is the common case; only lower-case on a mismatch
     if doc_type != "node":
-        return False, f"Invalid document type: {doc_type}"
+        doc_type = doc_type.lower()
+        if doc_type != "node":
+            return False, f"Invalid document type: {doc_type}"
 
-    if not (node.get("id") or node.get("_key")):
+    node_id = get("id", _MISSING)
+    if not ((node_id is not _MISSING and node_id) or get("_key")):
         return False, "Node document must have either 'id' or '_key' field"
 
     # Validate ID format if present
-    if "id" in node and not isinstance(node["id"], (str, int)):
-        return False, f"Invalid node id type: {type(node['id'])}"
+    if node_id is not _MISSING and not isinstance(node_id, (str, int)):
+        return False, f"Invalid node id type: {type(node_id)}"
 
     # Check properties
-    if "properties" in node and not isinstance(node["properties"], dict):
+    properties = get("properties", _MISSING)
+    if properties is not _MISSING and not isinstance(properties, dict):
         return False, "Node properties must be a dictionary"
 
     # Validate label if present
-    if "label" in node and not isinstance(node["label"], str):
+    label = get("label", _MISSING)
+    if label is not _MISSING and not isinstance(label, str):
         return False, "Node label must be a string"
 
     return True, "Valid"
@@ -130,40 +116,56 @@ def examine_missing_nodes(
         username: Database username
         password: Database password
     """
-    print(f"Loading nodes from {jsonl_path}...")
-    all_nodes = load_jsonl_nodes(jsonl_path)
-    print(f"Found {len(all_nodes)} nodes in JSONL file")
-    
+    # Equal counts are taken as a reason to skip the ID comparison. They
+    # don't prove that no node is missing, since the ArangoDB count includes
+    # every document. Both counts are cheap: ArangoDB answers from collection
+    # metadata, and the file pass keeps a hash per distinct node ID.
     print(f"Connecting to ArangoDB at {host}:{port}...")
+    try:
+        db = connect_db(host, port, db_name, username, password)
+        arango_count = count_arango_nodes(db)
+    except Exception as e:
+        print(f"Error counting ArangoDB nodes: {e}")
+        arango_count = None
+    jsonl_count = count_jsonl_nodes(jsonl_path)
+    if arango_count == jsonl_count:
+        print(f"ArangoDB and {jsonl_path} both have {arango_count} nodes")
+        print("\nNode counts are equal; skipping the ID comparison")
+        return
+    
     arango_node_ids = get_arango_node_ids(host, port, db_name, username, password)
     print(f"Found {len(arango_node_ids)} nodes in ArangoDB")
     
-    missing_ids = set(all_nodes.keys()) - arango_node_ids
+    # The scan keeps data only for nodes ArangoDB doesn't have
+    print(f"Loading nodes from {jsonl_path}...")
+    _, all_nodes = scan_jsonl_nodes(jsonl_path, exclude=arango_node_ids)
+    print(f"Found {jsonl_count} nodes in JSONL file")
+    
+    missing_ids = set(all_nodes)
     print(f"\nMissing nodes: {len(missing_ids)}")
     
     if missing_ids:
-        missing_nodes = {id: all_nodes[id] for id in missing_ids}
-        
-        # Analyze label distribution
-        label_counts = {}
-        for node_id, node in missing_nodes.items():
-            labels = node.get('labels', [])
-            for label in labels:
-                label_counts[label] = label_counts.get(label, 0) + 1
-        
-        print("\nLabel distribution of missing nodes:")
-        for label, count in sorted(label_counts.items(), key=lambda x: x[1], reverse=True):
-            print(f"  - {label}: {count}")
+        # The scan already kept only the missing nodes
+        missing_nodes = all_nodes
         
-        # Check validation status
+        # Gather labels, validation results and property patterns in one
+        # pass over the missing nodes
+        label_counts = Counter()
         invalid_nodes = []
-        validation_failures = {}
+        validation_failures = Counter()
+        property_patterns = Counter()
         
         for node_id, node in missing_nodes.items():
+            label_counts.update(node.get('labels', ()))
             is_valid, reason = check_node_validation(node)
             if not is_valid:
                 invalid_nodes.append(node_id)
-                validation_failures[reason] = validation_failures.get(reason, 0) + 1
+                validation_failures[reason] += 1
+            property_patterns[f"has_properties={bool(node.get('properties'))}"] += 1
+        
+        print("\nLabel distribution of missing nodes:")
+        for label, count in label_counts.most_common():
+            print(f"  - {label}: {count}")
         
         if invalid_nodes:
             print(f"\nFound {len(invalid_nodes)} nodes that would fail validation:")
@@ -180,15 +182,6 @@ def examine_missing_nodes(
         else:
             print("\nAll missing nodes would pass validation.")
             
-        # Examine structure patterns
-        property_patterns = {}
-        for node_id, node in missing_nodes.items():
-            props = node.get('properties', {})
-            has_properties = len(props) > 0
-            
-            pattern = f"has_properties={has_properties}"
-            property_patterns[pattern] = property_patterns.get(pattern, 0) + 1
-        
         print("\nProperty patterns in missing nodes:")
         for pattern, count in property_patterns.items():
             print(f"  - {pattern}: {count}")
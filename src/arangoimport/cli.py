@@ -1,37 +1,140 @@
 """Command line interface for arangoimport."""
 
 import os
-from typing import Any
-import json
+import sys
+from functools import cache
+from typing import TYPE_CHECKING, cast
+from urllib.parse import urlsplit
 
 import click
-from rich.console import Console
 
-from .importer import ImportConfig, parallel_load_data
-from .id_mapping import IDMapper
+from .config import ImportConfig
 from .log_config import get_logger, setup_logging
-from arango.client import ArangoClient
-from arango.database import Database
-from arango.exceptions import ArangoClientError, ArangoServerError, ArangoError
 
-# Import provider functionality
-from .providers import list_providers
+if TYPE_CHECKING:
+    from arango.client import ArangoClient
+    from arango.cursor import Cursor
+    from arango.exceptions import ArangoError
+    from rich.console import Console
 
-console = Console()
 logger = get_logger(__name__)
 
+_CPU_COUNT = os.cpu_count() or 1
+
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+# Below this much input per worker, starting another process costs more than
+# the work it takes over, so small files are imported by a single worker.
+_MIN_BYTES_PER_PROCESS = 16 * 1024 * 1024
+
+@cache
+def get_console() -> "Console":
+    """Return the shared rich console, importing rich on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+def _resolve_processes(requested: int | None, file_size: int) -> int:
+    """Pick the number of import workers for a file.
+
+    Args:
+        requested: Number of processes asked for, or None for CPU count - 1
+        file_size: Size of the input file in bytes
+
+    Returns:
+        int: Number of worker processes to start
+    """
+    processes = requested or max(1, _CPU_COUNT - 1)
+    return min(processes, max(1, -(-file_size // _MIN_BYTES_PER_PROCESS)))
+
+
+@cache
+def _parse_host(host: str, port: int) -> tuple[str, int]:
+    """Split a --host value into host name and port.
+
+    Accepts ``host``, ``host:port``, ``[ipv6]:port`` and ``http://`` URLs.
+    A port given in the host overrides ``port``.
+
+    Args:
+        host: Value of the --host option
+        port: Value of the --port option
+
+    Returns:
+        tuple[str, int]: Host name and port
+
+    Raises:
+        ValueError: If the host has a port that isn't a number or a scheme
+            other than http
+    """
+    parts = urlsplit(host if "//" in host else f"//{host}")
+    if parts.scheme not in ("", "http"):
+        raise ValueError(f"Unsupported scheme '{parts.scheme}' in host '{host}'")
+    return parts.hostname or host, parts.port or port
+
+
+def _build_conn_url(host: str, port: int) -> str:
+    """Build the ArangoDB server URL, bracketing IPv6 addresses."""
+    if ":" in host:
+        return f"http://[{host}]:{port}"
+    return f"http://{host}:{port}"
+
+
+@cache
+def _get_client(host: str, port: int) -> "ArangoClient":
+    """Return the client for an ArangoDB server, shared by every command.
+
+    Commands invoked in the same process (e.g. from a script through
+    click's API) reuse one client and its HTTP connection pool.
+    """
+    from arango.client import ArangoClient
+
+    return ArangoClient(hosts=_build_conn_url(host, port))
+
+
+def _format_arango_error(e: "ArangoError") -> str:
+    """Format an ArangoDB error, with the HTTP status when there was a response.
+
+    Args:
+        e: Error raised by python-arango
+
+    Returns:
+        str: Message for the console
+    """
+    response = getattr(e, "response", None)
+    if response is None:
+        return str(e)
+    message = getattr(e, "error_message", None) or e
+    return f"{response.status_code} {response.status_text} - {message}"
+
 
 @click.group()
 @click.version_option()
 @click.option(
     "--log-level",
-    type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'], case_sensitive=False),
+    type=click.Choice(_LOG_LEVELS, case_sensitive=False),
     default='WARNING',
     help='Set the logging level (default: WARNING)'
 )
 def cli(log_level: str) -> None:
     """ArangoImport - Import data into ArangoDB with ease."""
+    # Logging opens a timestamped log file, so it is set up by each command
+    # once it runs (see _setup_logging) rather than here, where it would also
+    # run for a subcommand's --help or a usage error.
+
+
+def _setup_logging(ctx: click.Context) -> str:
+    """Set up logging at the level given to the cli group.
+
+    Args:
+        ctx: Context of the running command
+
+    Returns:
+        str: The logging level string
+    """
+    log_level: str = ctx.find_root().params.get("log_level", "WARNING")
     setup_logging(level_str=log_level)
+    return log_level
 
 
 @cli.command()
@@ -52,7 +155,14 @@ def cli(log_level: str) -> None:
 @click.option(
     "--password", envvar="ARANGO_PASSWORD", default="", help="Database password"
 )
-@click.option("--processes", type=int, default=os.cpu_count(), help="Number of worker processes")
+@click.option(
+    "--processes",
+    type=int,
+    default=None,
+    help="Number of worker processes (default: CPU count - 1, fewer for files under "
+    "16 MiB per worker). Each worker holds its own batches in memory, so more "
+    "workers need more RAM.",
+)
 @click.option("--create-db", is_flag=True, default=True, help="Create database if it doesn't exist (default: True)")
 @click.option("--overwrite-db", is_flag=True, default=False, help="Drop database if it exists before import (default: False)")
 @click.option("--collection-nodes", default="Nodes", help="Node collection name")
@@ -68,7 +178,7 @@ def import_data(
     db_name: str,
     username: str,
     password: str,
-    processes: int,
+    processes: int | None,
     create_db: bool,
     overwrite_db: bool,
     collection_nodes: str,
@@ -77,23 +187,34 @@ def import_data(
     stop_on_error: bool,
 ) -> None:
     """Import data from a JSONL file into ArangoDB."""
-    # Retrieve log_level from the parent context
-    log_level = ctx.parent.params['log_level']
+    from arango.exceptions import ArangoError
+    from rich.markup import escape
+
+    # The import pipeline (and python-arango with it) is loaded here, so
+    # --help and the small query/drop commands don't pay for it at startup
+    from . import importer
+
+    console = get_console()
+    log_level = _setup_logging(ctx)
 
     # Parse host and port
-    if ":" in host:
-        host_part, port_part_str = host.split(":", 1)
-        try:
-            port_part = int(port_part_str)
-            host = host_part
-            port = port_part  # Override port option if specified in host
-        except ValueError:
-            console.print(f"[red]Error: Invalid port '{port_part_str}' in host string '{host}'.[/red]")
-            raise click.Abort()
+    try:
+        host, port = _parse_host(host, port)
+    except ValueError as e:
+        console.print(f"[red]Error: Invalid host '{host}': {e}.[/red]")
+        raise click.Abort() from e
 
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
+    resolved_processes = _resolve_processes(processes, os.path.getsize(file_path))
+    if processes and resolved_processes < processes:
+        logger.info(
+            f"Using {resolved_processes} of {processes} processes "
+            "for a small input file"
+        )
+    processes = resolved_processes
+
     try:
         # Create database configuration
         db_config = {
@@ -122,11 +243,8 @@ def import_data(
             skip_missing_refs=True
         )
 
-        logger.info(
-            f"Starting import for {file_path} into {host}:{port}/{db_name} "
-            f"using {processes} processes."
-        )
-        _nodes_added, _edges_added = parallel_load_data(
+        logger.info(f"Starting import for {file_path} into {host}:{port}/{db_name}")
+        _nodes_added, _edges_added = importer.parallel_load_data(
             file_path,
             db_config=db_config,
             processes=processes,
@@ -138,26 +256,31 @@ def import_data(
         metrics = import_config.get_metrics()
         metrics_dict = metrics.to_dict()
         
-        console.print("[green]Import successfully completed![/green]")
-        console.print("\n[blue]Quality Metrics:[/blue]")
-        console.print(f"Total documents processed: {metrics_dict['total_documents']:,}")
-        console.print(f"Valid documents: {metrics_dict['valid_documents']:,}")
-        console.print(f"Invalid documents: {metrics_dict['invalid_documents']:,}")
-        console.print(f"Duplicates found: {metrics_dict['duplicates_found']:,}")
-        console.print(f"Missing references: {metrics_dict['missing_references']:,}")
-        console.print(f"Validity ratio: {metrics_dict['validity_ratio']:.2%}")
+        # Rendered as one block so rich parses and writes the summary once
+        lines = [
+            "[green]Import successfully completed![/green]",
+            "\n[blue]Quality Metrics:[/blue]",
+            f"Total documents processed: {metrics_dict['total_documents']:,}",
+            f"Valid documents: {metrics_dict['valid_documents']:,}",
+            f"Invalid documents: {metrics_dict['invalid_documents']:,}",
+            f"Duplicates found: {metrics_dict['duplicates_found']:,}",
+            f"Missing references: {metrics_dict['missing_references']:,}",
+            f"Validity ratio: {metrics_dict['validity_ratio']:.2%}",
+        ]
         
         if metrics_dict['validation_errors']:
-            console.print("\n[yellow]Validation Errors (first 5):[/yellow]")
-            for error in metrics_dict['validation_errors'][:5]:
-                console.print(f"- {error}")
+            lines.append("\n[yellow]Validation Errors (first 5):[/yellow]")
+            # Error text comes from the data, so keep rich from reading it as markup
+            errors = metrics_dict['validation_errors'][:5]
+            lines.extend(f"- {escape(error)}" for error in errors)
+        
+        console.print("\n".join(lines))
 
     except ConnectionError as e:
         console.print(f"[red]Unable to establish connection: {e!s}[/red]")
         raise click.Abort() from e
-    except (ArangoClientError, ArangoServerError, ArangoError) as e:
-        error_msg = getattr(e, 'error_message', str(e))
-        console.print(f"[red]ArangoDB error: {error_msg}[/red]")
+    except ArangoError as e:
+        console.print(f"[red]ArangoDB error: {_format_arango_error(e)}[/red]")
         raise click.Abort() from e
     except Exception as e:
         console.print(f"[red]Unexpected error: {e!s}[/red]")
@@ -175,19 +298,32 @@ def import_data(
 )
 @click.option("--db-name", default="spokeV6", help="Database name")
 @click.option("--query", "query_string", required=True, help="AQL query to execute")
+@click.option(
+    "--jsonl",
+    is_flag=True,
+    default=False,
+    help="Print one result per line instead of a JSON array",
+)
+@click.pass_context
 def query_db(
+    ctx: click.Context,
     host: str,
     port: int,
     username: str,
     password: str,
     db_name: str,
     query_string: str,
+    jsonl: bool,
 ) -> None:
     """Execute an AQL query against the specified ArangoDB database."""
+    import orjson
+    from arango.exceptions import ArangoError
+
+    console = get_console()
+    _setup_logging(ctx)
     try:
         # Connect using python-arango
-        conn_url = f"http://{host}:{port}"
-        client = ArangoClient(hosts=conn_url)
+        client = _get_client(host, port)
         # System database connection needed to access specific DB
         sys_db = client.db("_system", username=username, password=password)
         # Check if target database exists and access it
@@ -198,14 +334,27 @@ def query_db(
 
         logger.info(f"Executing query on database '{db_name}': {query_string}")
         # Execute the query using python-arango API
-        cursor = db.aql.execute(query_string)
+        cursor = cast("Cursor", db.aql.execute(query_string))
 
-        # Print results as JSON list
-        results_list = list(cursor)
-        console.print(json.dumps(results_list, indent=2))
+        # Stream the results as they arrive from the cursor rather than
+        # collecting them first. orjson encodes straight to bytes, and writing
+        # them raw keeps rich from parsing "[...]" in the data as markup.
+        stdout = sys.stdout.buffer
+        if jsonl:
+            for doc in cursor:
+                stdout.write(orjson.dumps(doc) + b"\n")
+        else:
+            # The same indented JSON array as json.dumps(results, indent=2),
+            # written one element at a time
+            separator = b"[\n  "
+            for doc in cursor:
+                encoded = orjson.dumps(doc, option=orjson.OPT_INDENT_2)
+                stdout.write(separator + encoded.replace(b"\n", b"\n  "))
+                separator = b",\n  "
+            stdout.write(b"[]\n" if separator == b"[\n  " else b"\n]\n")
 
-    except (ArangoClientError, ArangoServerError) as e:
-        console.print(f"[red]ArangoDB query error: {e.http_exception.response.status_code} {e.http_exception.response.reason} - {e.error_message}[/red]")
+    except ArangoError as e:
+        console.print(f"[red]ArangoDB query error: {_format_arango_error(e)}[/red]")
         logger.error(f"AQL query failed: {e}")
         raise click.Abort() from e
     except Exception as e:
@@ -225,7 +374,9 @@ def query_db(
     "--password", envvar="ARANGO_PASSWORD", default="", help="Database password"
 )
 @click.option("--yes", is_flag=True, help="Confirm database deletion without prompting.")
+@click.pass_context
 def drop_db(
+    ctx: click.Context,
     db_name_to_drop: str,
     host: str,
     port: int,
@@ -234,6 +385,11 @@ def drop_db(
     yes: bool,
 ) -> None:
     """Drop (delete) the specified ArangoDB database."""
+    from arango.errno import DATABASE_NOT_FOUND
+    from arango.exceptions import ArangoError
+
+    console = get_console()
+    _setup_logging(ctx)
     if not yes:
         click.confirm(
             f"Are you sure you want to drop the database '{db_name_to_drop}'?",
@@ -242,35 +398,29 @@ def drop_db(
 
     try:
         # Connect using python-arango
-        conn_url = f"http://{host}:{port}"
-        client = ArangoClient(hosts=conn_url)
+        client = _get_client(host, port)
         # System database connection needed to drop other databases
         sys_db = client.db("_system", username=username, password=password)
 
-        # Check if target database exists
-        if not sys_db.has_database(db_name_to_drop):
-            console.print(f"[yellow]Database '{db_name_to_drop}' not found. Nothing to drop.[/yellow]")
-            return # Exit gracefully
-
         logger.info(f"Attempting to drop database '{db_name_to_drop}'")
-        # Drop the database
-        if sys_db.delete_database(db_name_to_drop):
+        # Drop the database. A missing database is reported by the delete
+        # itself, so there is no separate existence check round trip.
+        if sys_db.delete_database(db_name_to_drop, ignore_missing=True):
             console.print(f"[green]Database '{db_name_to_drop}' dropped successfully.[/green]")
             logger.info(f"Database '{db_name_to_drop}' dropped.")
         else:
-            # This case might not be reachable if has_database is accurate
-            # and permissions are correct, but good to handle.
-            console.print(f"[red]Failed to drop database '{db_name_to_drop}'. It might not exist or there could be a permission issue.[/red]")
-            logger.warning(f"Failed to drop database '{db_name_to_drop}'.")
-            raise click.Abort()
+            console.print(
+                f"[yellow]Database '{db_name_to_drop}' not found. "
+                "Nothing to drop.[/yellow]"
+            )
 
-    except (ArangoClientError, ArangoServerError) as e:
+    except ArangoError as e:
         # Check if it's a 'database not found' error, which is okay in this context
-        if hasattr(e, 'http_exception') and hasattr(e.http_exception, 'response') and e.http_exception.response.status_code == 404 and e.error_code == 1228: # 1228 is ERROR_ARANGO_DATABASE_NOT_FOUND
+        if getattr(e, "error_code", None) == DATABASE_NOT_FOUND:
              console.print(f"[yellow]Database '{db_name_to_drop}' not found. Nothing to drop.[/yellow]")
         else:
-            error_msg = f"{e.http_exception.response.status_code} {e.http_exception.response.reason} - {e.error_message}"
-            console.print(f"[red]ArangoDB error during drop: {error_msg}[/red]")
+            message = _format_arango_error(e)
+            console.print(f"[red]ArangoDB error during drop: {message}[/red]")
             logger.error(f"Database drop failed: {e}")
             raise click.Abort() from e
     except Exception as e:
@@ -1,23 +1,31 @@
 """ArangoDB connection management."""
 
 import fcntl
+import json
+import os
 import threading
 import time
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
-from queue import Empty, Queue
+from queue import Empty, LifoQueue
 from typing import Any, TypedDict
+from urllib.parse import quote, urlsplit
 
+import orjson
 from arango.client import ArangoClient
 from arango.collection import StandardCollection
-from arango.database import Database
+from arango.database import Database, StandardDatabase
+from arango.errno import DATABASE_NOT_FOUND, DUPLICATE_NAME
 from arango.exceptions import (
     ArangoClientError,
     ArangoServerError,
     CollectionCreateError,
+    DatabaseCreateError,
 )
-from arango.job import AsyncJob, BatchJob
+from arango.http import DefaultHTTPClient
+from arango.job import AsyncJob
 
 from arangoimport.log_config import get_logger
 
@@ -27,39 +35,158 @@ logger = get_logger(__name__)
 EDGE_COLLECTION_TYPE = "edge"
 EDGE_COLLECTION_TYPE_ID = 3  # ArangoDB internal type ID for edge collections
 
+# Upper bound on collections whose indexes are disabled or rebuilt at once
+_MAX_INDEX_WORKERS = 16
+
+# Index fields saved when an index is disabled; enough to rebuild it
+_INDEX_KEEP_KEYS = frozenset(
+    {
+        "id",
+        "type",
+        "fields",
+        "name",
+        "unique",
+        "sparse",
+        "expiry_time",
+        "geo_json",
+        "min_length",
+    }
+)
 
-@dataclass
-class RetryConfig:
-    """Configuration for retry behavior."""
+# Recreate a disabled index from its saved definition, keyed by index type.
+# Each builder takes the collection, its name and the saved definition.
+_INDEX_BUILDERS: dict[str, Callable[[StandardCollection, str, dict[str, Any]], Any]] = {
+    "hash": lambda c, name, idx: c.add_index(
+        {
+            "type": "hash",
+            "fields": idx["fields"],
+            "name": idx.get("name", f"{name}_hash_index"),
+            "unique": idx.get("unique", False),
+            "sparse": idx.get("sparse", False),
+        }
+    ),
+    "skiplist": lambda c, name, idx: c.add_skiplist_index(
+        fields=idx["fields"],
+        unique=idx.get("unique", False),
+        sparse=idx.get("sparse", False),
+    ),
+    "persistent": lambda c, name, idx: c.add_persistent_index(
+        fields=idx["fields"],
+        unique=idx.get("unique", False),
+        sparse=idx.get("sparse", False),
+    ),
+    "ttl": lambda c, name, idx: c.add_ttl_index(
+        fields=idx["fields"],
+        expiry_time=idx.get("expiry_time", 0),
+    ),
+    "geo": lambda c, name, idx: c.add_geo_index(
+        fields=idx["fields"],
+        geo_json=idx.get("geo_json", False),
+    ),
+    "fulltext": lambda c, name, idx: c.add_fulltext_index(
+        fields=idx["fields"],
+        min_length=idx.get("min_length", None),
+    ),
+}
+
+# Index definitions saved per server and database while its indexes are
+# disabled, so indexes disabled by a process that died before rebuilding them
+# can still be rebuilt. Kept in the user's state directory.
+_DISABLED_INDEXES_FILE = "disabled_indexes_{}.json"
+
+# Lock files stay open for the life of the process, so taking a lock is a
+# single flock() call rather than open() + flock() + close() each time.
+_LOCK_FDS: dict[tuple[int, str], int] = {}
+_THREAD_LOCKS: dict[tuple[int, str], threading.Lock] = {}
+_LOCK_FDS_LOCK = threading.Lock()
+
+
+def _index_fingerprint(idx: dict[str, Any]) -> tuple[str, bytes]:
+    """Return a hashable key for an index's type and fields.
+
+    Fields are serialized rather than made a tuple, since an inverted index
+    lists its fields as dicts.
 
-    max_retries: int
-    retry_delay: float
+    Args:
+        idx: Index definition
 
+    Returns:
+        tuple[str, bytes]: Index type and serialized fields
+    """
+    return idx["type"], orjson.dumps(idx["fields"], option=orjson.OPT_SORT_KEYS)
 
-@dataclass
-class ImportConfig:
-    """Configuration for data import."""
 
-    host: str = "localhost"
-    port: int = 8529
-    username: str = "root"
-    password: str | None = None
-    db_name: str = "spokeV6"
-    processes: int = 4
+def _state_dir() -> str:
+    """Return this user's arangoimport state directory, creating it if missing.
 
-    def to_dict(self) -> dict[str, Any]:
-        """Convert config to dictionary.
+    The directory follows the XDG base directory spec and is private to the
+    user (mode 0700), so the files in it cannot be read or replaced by others.
+
+    Returns:
+        str: Path of the state directory
+    """
+    base = os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state")
+    path = os.path.join(base, "arangoimport")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
 
-        Returns:
-            dict[str, Any]: Dictionary representation of config
-        """
-        return {
-            "host": self.host,
-            "port": self.port,
-            "username": self.username,
-            "password": self.password,
-            "db_name": self.db_name,
-        }
+
+def _job_result(result: Any) -> Any:
+    """Return the result of a python-arango call, waiting for it if it is a job.
+
+    Async jobs are polled with a short, growing delay until the server has
+    finished them. The job's error, if any, is raised.
+
+    Args:
+        result: Value or AsyncJob/BatchJob returned by python-arango
+
+    Returns:
+        Any: The call's result
+    """
+    if isinstance(result, AsyncJob):
+        delay = 0.005
+        while result.status() == "pending":
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+    # Any other object with a result() method is a BatchJob. An attribute
+    # lookup is a few times cheaper than isinstance() against a union, which
+    # builds the union object on every call.
+    get_result = getattr(result, "result", None)
+    return get_result() if callable(get_result) else result
+
+
+@contextmanager
+def _file_lock(path: str) -> Generator[None, None, None]:
+    """Hold an exclusive lock on a file, shared across processes.
+
+    flock() locks belong to the open file description, which threads share
+    and a forked child inherits. Descriptors are therefore keyed by process
+    id, and threads of one process take a thread lock first.
+
+    Args:
+        path: Path of the lock file, created if missing
+    """
+    key = (os.getpid(), path)
+    with _LOCK_FDS_LOCK:
+        fd = _LOCK_FDS.get(key)
+        if fd is None:
+            fd = _LOCK_FDS[key] = os.open(path, os.O_CREAT | os.O_RDWR, 0o600)
+            _THREAD_LOCKS[key] = threading.Lock()
+        thread_lock = _THREAD_LOCKS[key]
+    with thread_lock:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@dataclass
+class RetryConfig:
+    """Configuration for retry behavior."""
+
+    max_retries: int
+    retry_delay: float
 
 
 class ArangoConfig(TypedDict, total=False):
@@ -75,6 +202,36 @@ class ArangoConfig(TypedDict, total=False):
     retry_delay: float
 
 
+class _PooledConnection:
+    """Context manager that checks a connection out of an ArangoConnection pool.
+
+    A plain class rather than a @contextmanager generator, since it is
+    entered for every database operation.
+    """
+
+    __slots__ = ("_connection", "_manager")
+
+    def __init__(self, manager: "ArangoConnection") -> None:
+        self._manager = manager
+        self._connection: Database | None = None
+
+    def __enter__(self) -> Database:
+        manager = self._manager
+        kept: Database | None = getattr(manager._tls, "connection", None)
+        if kept is not None:
+            return kept
+        connection = manager._get_connection()
+        if not manager._keep_for_thread(connection):
+            # Returned to the pool on exit
+            self._connection = connection
+        return connection
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._connection is not None:
+            self._manager.pool.put(self._connection)
+            self._connection = None
+
+
 class ArangoConnection:
     """ArangoDB connection manager."""
 
@@ -96,17 +253,21 @@ class ArangoConnection:
             **kwargs: Additional configuration options
         """
         try:
-            # Parse host and port correctly
+            # Parse host and port correctly. A bare IPv6 address has several
+            # colons and no port; one with a port comes as [address]:port.
             parsed_host = host
             parsed_port = port
-            if ':' in host:
-                host_parts = host.split(':')
-                parsed_host = host_parts[0]
+            if host.startswith('[') or host.count(':') == 1:
                 try:
-                    parsed_port = int(host_parts[1])
-                except (ValueError, IndexError):
-                    # Handle potential errors if port part is not a valid integer or missing
-                    raise ArangoError(f"Invalid host format: {host}. Expected format 'host' or 'host:port'.")
+                    host_parts = urlsplit(f"//{host}")
+                    parsed_host = host_parts.hostname or host
+                    parsed_port = host_parts.port or port
+                except ValueError as e:
+                    # Handle potential errors if port part is not a valid integer
+                    raise ArangoError(
+                        f"Invalid host format: {host}. Expected format "
+                        "'host', 'host:port' or '[ipv6]:port'."
+                    ) from e
 
             config: ArangoConfig = {
                 "host": parsed_host,
@@ -129,11 +290,42 @@ class ArangoConnection:
             self.retry_delay = config["retry_delay"]
 
             # Initialize client with correctly parsed host and port
-            self.client = ArangoClient(hosts=f"http://{self.host}:{self.port}")
-            self.pool: Queue[Database] = Queue(maxsize=self.pool_size)
+            # Every database handle from the client shares its HTTP session,
+            # so size the session's socket pool for the whole handle pool;
+            # at the default of 10, extra concurrent requests open sockets
+            # that are thrown away afterwards.
+            url_host = f"[{self.host}]" if ':' in self.host else self.host
+            self.client = ArangoClient(
+                hosts=f"http://{url_host}:{self.port}",
+                http_client=DefaultHTTPClient(
+                    pool_connections=self.pool_size,
+                    pool_maxsize=self.pool_size * 2,
+                ),
+            )
+            # Handle on _system for database management. Building it makes no
+            # request (credentials go with each call), so one serves every call.
+            self._sys_db = self.client.db(
+                "_system", username=self.username, password=self.password
+            )
+            # LIFO hands back the most recently returned connection, so a few
+            # stay warm under light load instead of rotating through them all
+            self.pool: LifoQueue[Database] = LifoQueue(maxsize=self.pool_size)
             self.lock = threading.Lock()
-            self.disabled_indexes: dict[str, list[dict[str, Any]]] = {}
+            # Disabled index definitions by database and collection, as
+            # saved to disk; reloaded by every manage_indexes call
+            self.disabled_indexes: dict[str, dict[str, list[dict[str, Any]]]] = {}
+            # Databases seen to exist; nothing here drops databases, so a
+            # positive answer never needs asking again
+            self._known_databases: set[str] = set()
+            # Databases whose Nodes and Edges collections are known to exist
+            self._ensured_collections: set[str] = set()
             self.connections_created = 0
+            # Connections kept by a thread across get_connection() calls. The
+            # thread-local makes the repeat lookup lock-free; the dict, guarded
+            # by self.lock, tracks the owners so a dead thread's connection
+            # can be taken back.
+            self._tls = threading.local()
+            self._thread_connections: dict[threading.Thread, Database] = {}
             self.edge_collection_type = kwargs.get("edge_collection_type", "edge")
             self._init_pool()
         except (ArangoClientError, OSError, ConnectionAbortedError) as e:
@@ -156,44 +348,27 @@ class ArangoConnection:
             ArangoError: If database creation fails due to connection,
                 authentication, or other client errors
         """
-        # Use file lock to synchronize database creation across processes
-        lock_file = f"/tmp/arango_db_{db_name}.lock"
-        with open(lock_file, "w") as f:
-            try:
-                # Get exclusive lock
-                fcntl.flock(f, fcntl.LOCK_EX)
-
-                sys_db = self.client.db(
-                    "_system", username=self.username, password=self.password
-                )
-                databases = sys_db.databases()
-
-                # Handle async/batch jobs
-                if isinstance(databases, AsyncJob | BatchJob):
-                    databases = databases.result()
+        # A database seen to exist needs no request
+        if db_name in self._known_databases:
+            return
 
-                # Check if database exists
-                if isinstance(databases, list) and db_name not in databases:
-                    try:
-                        sys_db.create_database(db_name)
-                        logger.info(f"Created database: {db_name}")
-                        # Sleep briefly to allow database creation to complete
-                        time.sleep(0.5)
-                    except ArangoClientError as e:
-                        # If error is duplicate database,
-                        # another process created it first
-                        if "duplicate" in str(e).lower():
-                            msg = "Database {} was already created by another process"
-                            logger.debug(msg.format(db_name))
-                        else:
-                            raise
-            except (OSError, ConnectionAbortedError) as e:
-                # Let the original error propagate through
-                logger.error(f"Error creating database {db_name}: {e}")
-                raise ArangoError(str(e)) from e
-            finally:
-                # Release lock
-                fcntl.flock(f, fcntl.LOCK_UN)
+        # No lock: the server creates a database at most once and answers
+        # any other attempt with a duplicate-name error, which works across
+        # hosts as well as processes
+        try:
+            try:
+                self._sys_db.create_database(db_name)
+                logger.info(f"Created database: {db_name}")
+            except DatabaseCreateError as e:
+                if e.error_code != DUPLICATE_NAME:
+                    raise
+                msg = "Database {} was already created by another process"
+                logger.debug(msg.format(db_name))
+            self._known_databases.add(db_name)
+        except (OSError, ConnectionAbortedError) as e:
+            # Let the original error propagate through
+            logger.error(f"Error creating database {db_name}: {e}")
+            raise ArangoError(str(e)) from e
 
     def _database_exists(self, db_name: str) -> bool:
         """Check if a database exists.
@@ -204,17 +379,16 @@ class ArangoConnection:
         Returns:
             bool: True if database exists, False otherwise
         """
+        if db_name in self._known_databases:
+            return True
         try:
-            sys_db = self.client.db(
-                "_system", username=self.username, password=self.password
-            )
-            dbs = sys_db.databases()
-
-            # Handle async/batch jobs
-            if hasattr(dbs, "result") and callable(dbs.result):
-                dbs = dbs.result()
+            sys_db = self._sys_db
+            dbs = _job_result(sys_db.databases())
 
-            return isinstance(dbs, list) and db_name in dbs
+            if not isinstance(dbs, list):
+                return False
+            self._known_databases.update(dbs)
+            return db_name in self._known_databases
 
         except Exception as e:
             logger.error("Error checking database existence: %s", e)
@@ -223,10 +397,6 @@ class ArangoConnection:
     def _init_pool(self) -> None:
         """Initialize connection pool."""
         try:
-            # Create database if it doesn't exist
-            if not self._database_exists(self.db_name):
-                self.create_database(self.db_name)
-
             # Initialize base connection
             self._base_connection = self.client.db(
                 self.db_name,
@@ -234,13 +404,22 @@ class ArangoConnection:
                 password=self.password,
             )
 
-            # Verify connection works
+            # Verify connection works. The same request shows whether the
+            # database exists, so the database list is only fetched when it
+            # does not.
             try:
-                self._base_connection.version()
+                try:
+                    self._base_connection.version()
+                except ArangoServerError as e:
+                    if e.error_code != DATABASE_NOT_FOUND:
+                        raise
+                    self.create_database(self.db_name)
+                    self._base_connection.version()
             except (ArangoClientError, OSError) as e:
                 # Let the original error propagate through
                 logger.error(f"Error verifying connection: {e}")
                 raise ArangoError(str(e)) from e
+            self._known_databases.add(self.db_name)
 
             # Add to pool
             self.pool.put(self._base_connection)
@@ -286,16 +465,25 @@ class ArangoConnection:
 
         Returns:
             Database: ArangoDB connection
+
+        Raises:
+            ArangoError: If the pool is at capacity and no connection is
+                returned within ``retry_delay * max_retries`` seconds
         """
         try:
             return self.pool.get_nowait()
+        except Empty:
+            pass
+        with self.lock:
+            if self.connections_created < self.pool_size:
+                self.connections_created += 1
+                return self._create_connection()
+        # Every connection is checked out; wait for one to be returned
+        # rather than failing the caller straight away.
+        try:
+            return self.pool.get(timeout=self.retry_delay * self.max_retries)
         except Empty as e:
-            with self.lock:
-                if self.connections_created < self.pool_size:
-                    self.connections_created += 1
-                    return self._create_connection()
-                else:
-                    raise Exception("Connection pool is empty") from e
+            raise ArangoError("Connection pool timeout") from e
 
     def _create_connection(self) -> Database:
         """Create a new connection.
@@ -313,18 +501,51 @@ class ArangoConnection:
             logger.error(f"Error creating connection: {e}")
             raise ArangoError(str(e)) from e
 
-    @contextmanager
-    def get_connection(self) -> Generator[Database, None, None]:
+    def get_connection(self) -> "_PooledConnection":
         """Get a connection from the pool.
 
-        Yields:
-            Database: ArangoDB connection
+        The first connection a thread gets is kept for that thread, so later
+        calls from it skip the pool's lock. At most pool_size - 1 threads keep
+        one; the rest take a connection from the pool and return it each time.
+
+        Returns:
+            _PooledConnection: Context manager yielding an ArangoDB connection
         """
-        connection = self._get_connection()
-        try:
-            yield connection
-        finally:
-            self.pool.put(connection)
+        return _PooledConnection(self)
+
+    def _keep_for_thread(self, connection: Database) -> bool:
+        """Keep a connection for the current thread if a slot is free.
+
+        One connection always stays in circulation, so threads beyond the
+        kept ones can still get a connection from the pool.
+
+        Args:
+            connection: Connection just taken from the pool
+
+        Returns:
+            bool: True if the thread now owns the connection
+        """
+        with self.lock:
+            kept = self._thread_connections
+            if len(kept) >= self.pool_size - 1:
+                # Hand back the connections of threads that have exited
+                for thread in [t for t in kept if not t.is_alive()]:
+                    self.pool.put(kept.pop(thread))
+                if len(kept) >= self.pool_size - 1:
+                    return False
+            kept[threading.current_thread()] = connection
+        self._tls.connection = connection
+        return True
+
+    def release_thread_connection(self) -> None:
+        """Return the current thread's kept connection, if any, to the pool."""
+        connection = getattr(self._tls, "connection", None)
+        if connection is None:
+            return
+        del self._tls.connection
+        with self.lock:
+            self._thread_connections.pop(threading.current_thread(), None)
+        self.pool.put(connection)
 
     def _return_connection(self, conn: Database) -> None:
         """Return a connection to the pool."""
@@ -334,6 +555,77 @@ class ArangoConnection:
             logger.error(f"Error returning connection to pool: {e}")
             raise
 
+    def _disabled_indexes_path(self, db_name: str) -> str:
+        """Return the file holding a database's disabled index definitions.
+
+        The file name is keyed by server and database, so same-named
+        databases on different servers do not share saved indexes.
+
+        Args:
+            db_name: Database name
+
+        Returns:
+            str: Path of the file
+        """
+        key = quote(f"{self.host}:{self.port}:{db_name}", safe="")
+        return os.path.join(_state_dir(), _DISABLED_INDEXES_FILE.format(key))
+
+    def _load_disabled_indexes(self, db_name: str) -> dict[str, list[dict[str, Any]]]:
+        """Load the index definitions saved for a database, if any.
+
+        Args:
+            db_name: Database name
+
+        Returns:
+            dict[str, list[dict[str, Any]]]: Saved index definitions by
+                collection name
+        """
+        path = self._disabled_indexes_path(db_name)
+        try:
+            with open(path, "rb") as f:
+                saved: dict[str, list[dict[str, Any]]] = json.load(f)
+                return saved
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable {path}: {e}")
+            return {}
+
+    def _save_disabled_indexes(
+        self,
+        db_name: str,
+        collection_name: str,
+        indexes: list[dict[str, Any]] | None,
+    ) -> None:
+        """Save or clear the disabled index definitions of one collection.
+
+        The file is re-read and replaced atomically under a lock shared with
+        other processes, so their collections' entries are kept. It is
+        removed once every index has been rebuilt.
+
+        Args:
+            db_name: Database name
+            collection_name: Collection name
+            indexes: Definitions to save, or None once they are rebuilt
+        """
+        path = self._disabled_indexes_path(db_name)
+        with _file_lock(f"{path}.lock"):
+            disabled = self._load_disabled_indexes(db_name)
+            if indexes is None:
+                disabled.pop(collection_name, None)
+            else:
+                disabled[collection_name] = indexes
+            if not disabled:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                return
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(disabled, f)
+            os.replace(tmp_path, path)
+
     def _get_collection_indexes(
         self, collection: StandardCollection
     ) -> list[dict[str, Any]]:
@@ -346,9 +638,7 @@ class ArangoConnection:
             list[dict[str, Any]]: List of index definitions
         """
         try:
-            result = collection.indexes()
-            if isinstance(result, AsyncJob | BatchJob):
-                result = result.result()
+            result = _job_result(collection.indexes())
             return (
                 [
                     idx
@@ -371,19 +661,62 @@ class ArangoConnection:
             collection: Collection object
             collection_name: Collection name
         """
+        db_name = collection.db_name
         try:
             # Get and store indexes
             indexes = self._get_collection_indexes(collection)
             if indexes:
-                self.disabled_indexes[collection_name] = indexes
-                # Delete indexes
-                for idx in indexes:
-                    collection.delete_index(idx["id"])
-                    logger.info(f"Disabled index {idx['id']} in {collection_name}")
+                # A process that died part way through deleting has saved
+                # indexes the server no longer lists. Keep those, and add
+                # the listed ones not saved already (by id, or by fields for
+                # an index rebuilt since under a new id).
+                saved = self.disabled_indexes.setdefault(db_name, {}).get(
+                    collection_name, []
+                )
+                saved_ids = {idx.get("id") for idx in saved}
+                saved_fields = {_index_fingerprint(idx) for idx in saved}
+                # Keep only what is needed to rebuild each index, not the
+                # figures and other metadata the server reports with it
+                merged = saved + [
+                    {k: v for k, v in idx.items() if k in _INDEX_KEEP_KEYS}
+                    for idx in indexes
+                    if idx["id"] not in saved_ids
+                    and _index_fingerprint(idx) not in saved_fields
+                ]
+                self.disabled_indexes[db_name][collection_name] = merged
+                self._save_disabled_indexes(db_name, collection_name, merged)
+                # Delete indexes. On an async collection every delete is sent
+                # before waiting on any of them.
+                jobs = [collection.delete_index(idx["id"]) for idx in indexes]
+                for job in jobs:
+                    _job_result(job)
+                logger.info(
+                    "Disabled %d indexes in %s: %s",
+                    len(indexes),
+                    collection_name,
+                    [idx["id"] for idx in indexes],
+                )
         except ArangoClientError as e:
             logger.error(f"Error disabling collection indexes: {e}")
             raise ArangoError(str(e)) from e
 
+    def _add_index(
+        self, collection: StandardCollection, collection_name: str, idx: dict[str, Any]
+    ) -> Any:
+        """Recreate a disabled index.
+
+        Args:
+            collection: Collection object
+            collection_name: Collection name
+            idx: Index definition saved when the index was disabled
+
+        Returns:
+            Any: The new index, or its job on an async collection (None for
+                an unsupported index type)
+        """
+        builder = _INDEX_BUILDERS.get(idx["type"])
+        return builder(collection, collection_name, idx) if builder else None
+
     def _rebuild_collection_indexes(
         self, collection: StandardCollection, collection_name: str
     ) -> None:
@@ -393,62 +726,65 @@ class ArangoConnection:
             collection: Collection object
             collection_name: Collection name
         """
+        db_name = collection.db_name
+        disabled = self.disabled_indexes.get(db_name, {})
         try:
             # Rebuild indexes if they were disabled
-            if collection_name in self.disabled_indexes:
-                for idx in self.disabled_indexes[collection_name]:
+            if collection_name in disabled:
+                indexes = disabled[collection_name]
+                # On an async collection every index build is sent before
+                # waiting on any of them, so the server builds them together.
+                jobs = []
+                for idx in indexes:
+                    try:
+                        jobs.append(self._add_index(collection, collection_name, idx))
+                    except ArangoServerError as e:
+                        raise ArangoError(f"Failed to rebuild index: {e}") from e
+                for job in jobs:
                     try:
-                        idx_type = idx["type"]
-                        idx_fields = idx["fields"]
-                        if idx_type == "hash":
-                            collection.add_index(
-                                {
-                                    "type": "hash",
-                                    "fields": idx_fields,
-                                    "name": idx.get(
-                                        "name", f"{collection_name}_hash_index"
-                                    ),
-                                    "unique": idx.get("unique", False),
-                                    "sparse": idx.get("sparse", False),
-                                }
-                            )
-                        elif idx_type == "skiplist":
-                            collection.add_skiplist_index(
-                                fields=idx_fields,
-                                unique=idx.get("unique", False),
-                                sparse=idx.get("sparse", False),
-                            )
-                        elif idx_type == "persistent":
-                            collection.add_persistent_index(
-                                fields=idx_fields,
-                                unique=idx.get("unique", False),
-                                sparse=idx.get("sparse", False),
-                            )
-                        elif idx_type == "ttl":
-                            collection.add_ttl_index(
-                                fields=idx_fields,
-                                expiry_time=idx.get("expiry_time", 0),
-                            )
-                        elif idx_type == "geo":
-                            collection.add_geo_index(
-                                fields=idx_fields,
-                                geo_json=idx.get("geo_json", False),
-                            )
-                        elif idx_type == "fulltext":
-                            collection.add_fulltext_index(
-                                fields=idx_fields,
-                                min_length=idx.get("min_length", None),
-                            )
-                        logger.info(f"Rebuilt index {idx['id']} in {collection_name}")
+                        _job_result(job)
                     except ArangoServerError as e:
                         raise ArangoError(f"Failed to rebuild index: {e}") from e
+                logger.info(
+                    "Rebuilt %d indexes in %s: %s",
+                    len(indexes),
+                    collection_name,
+                    [idx["id"] for idx in indexes],
+                )
                 # Clear disabled indexes
-                del self.disabled_indexes[collection_name]
+                del disabled[collection_name]
+                self._save_disabled_indexes(db_name, collection_name, None)
         except Exception as e:
             logger.error(f"Error rebuilding collection indexes: {e}")
             raise ArangoError(str(e)) from e
 
-    def manage_indexes(self, db: Database, disable: bool = False) -> None:
+    def _manage_collection_indexes(
+        self, db: StandardDatabase, col_name: str, disable: bool
+    ) -> None:
+        """Disable or rebuild the indexes of one collection.
+
+        Runs in a worker thread of manage_indexes, so it starts its own
+        async execution context rather than sharing one across threads.
+
+        Args:
+            db: Database object
+            col_name: Collection name
+            disable: If True, disable the indexes; otherwise rebuild them
+        """
+        # Database.collection() returns a StandardCollection for document
+        # and edge collections alike, so there is no type to check here
+        collection = db.begin_async_execution(return_result=True).collection(col_name)
+
+        try:
+            if disable:
+                self._disable_collection_indexes(collection, col_name)
+            else:
+                self._rebuild_collection_indexes(collection, col_name)
+        except ArangoClientError as e:
+            logger.error(f"Error managing indexes for collection {col_name}: {e}")
+            raise ArangoError(str(e)) from e
+
+    def manage_indexes(self, db: StandardDatabase, disable: bool = False) -> None:
         """Manage database indexes.
 
         Args:
@@ -459,35 +795,42 @@ class ArangoConnection:
         Raises:
             ArangoError: If an error occurs while managing indexes
         """
+        # Pick up indexes left disabled by a process that died since
+        self.disabled_indexes[db.name] = self._load_disabled_indexes(db.name)
         try:
             # Get collections
-            collections_result = db.collections()
-            if isinstance(collections_result, AsyncJob | BatchJob):
-                collections_result = collections_result.result()
+            collections_result = _job_result(db.collections())
             if not collections_result:
                 logger.info("No collections found")
                 return
 
-            # Process each collection
-            for col_info in collections_result:
-                col_name = col_info["name"]
-                if col_name.startswith("_"):  # Skip system collections
-                    continue
-
-                collection = db[col_name]
-                if not isinstance(collection, StandardCollection):
-                    continue  # type: ignore[unreachable]
-
-                try:
-                    if disable:
-                        self._disable_collection_indexes(collection, col_name)
-                    else:
-                        self._rebuild_collection_indexes(collection, col_name)
-                except ArangoClientError as e:
-                    logger.error(
-                        f"Error managing indexes for collection {col_name}: {e}"
-                    )
-                    raise ArangoError(str(e)) from e
+            col_names = [
+                col_info["name"]
+                for col_info in collections_result
+                if not col_info["name"].startswith("_")  # Skip system collections
+            ]
+            # On rebuild, skip collections that were never disabled
+            if not disable:
+                disabled = self.disabled_indexes[db.name]
+                col_names = [n for n in col_names if n in disabled]
+
+            # Collections are handled in parallel, and within one collection
+            # the index requests go through async execution, so they are in
+            # flight together rather than one per round trip.
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(_MAX_INDEX_WORKERS, len(col_names)))
+            ) as executor:
+                futures = [
+                    executor.submit(self._manage_collection_indexes, db, name, disable)
+                    for name in col_names
+                ]
+                # Let every collection finish, then raise the first failure
+                errors = [f.exception() for f in futures]
+            for error in errors:
+                if isinstance(error, ArangoError):
+                    raise error
+                if error is not None:
+                    raise ArangoError(str(error)) from error
 
             logger.info("Indexes %s", "disabled" if disable else "rebuilt")
 
@@ -501,37 +844,29 @@ class ArangoConnection:
         Args:
             db: Database object
         """
-        # Use file lock to synchronize collection creation across processes
-        lock_file = f"/tmp/arango_collections_{self.db_name}.lock"
-        with open(lock_file, "w") as f:
+        if db.name in self._ensured_collections:
+            return
+
+        # One listing answers both existence checks
+        existing = {c["name"] for c in _job_result(db.collections())}
+
+        # No lock: the server creates a collection at most once and answers
+        # any other attempt with a duplicate-name error
+        for name, edge in (
+            ("Nodes", False),
+            ("Edges", self.edge_collection_type == "edge"),
+        ):
+            if name in existing:
+                continue
             try:
-                # Get exclusive lock
-                fcntl.flock(f, fcntl.LOCK_EX)
-
-                try:
-                    # Create Nodes collection if it doesn't exist
-                    if not db.has_collection("Nodes"):
-                        db.create_collection("Nodes")
-                        logger.info("Created Nodes collection")
-                        # Sleep briefly to allow collection creation to complete
-                        time.sleep(0.5)
-
-                    # Create Edges collection if it doesn't exist
-                    if not db.has_collection("Edges"):
-                        db.create_collection(
-                            "Edges", edge=(self.edge_collection_type == "edge")
-                        )
-                        logger.info("Created Edges collection")
-                        # Sleep briefly to allow collection creation to complete
-                        time.sleep(0.5)
-                except CollectionCreateError as e:
-                    if "duplicate" not in str(e).lower():
-                        logger.error(f"Error creating collections: {e}")
-                        raise
-                    logger.debug("Collections already exist")
-            finally:
-                # Release lock
-                fcntl.flock(f, fcntl.LOCK_UN)
+                db.create_collection(name, edge=edge)
+                logger.info(f"Created {name} collection")
+            except CollectionCreateError as e:
+                if e.error_code != DUPLICATE_NAME:
+                    logger.error(f"Error creating collections: {e}")
+                    raise
+                logger.debug(f"{name} collection already exists")
+        self._ensured_collections.add(db.name)
 
 
 class ArangoError(Exception):
@@ -551,43 +886,3 @@ class ArangoError(Exception):
     """
 
     pass
-
-
-def ensure_collections(self, db: Database) -> None:
-    """Ensure required collections exist and are of correct type.
-
-    Args:
-        db: Database object
-    """
-    # Use file lock to synchronize collection creation across processes
-    lock_file = f"/tmp/arango_collections_{self.db_name}.lock"
-    with open(lock_file, "w") as f:
-        try:
-            # Get exclusive lock
-            fcntl.flock(f, fcntl.LOCK_EX)
-
-            try:
-                # Create Nodes collection if it doesn't exist
-                if not db.has_collection("Nodes"):
-                    db.create_collection("Nodes")
-                    logger.info("Created Nodes collection")
-                    # Sleep briefly to allow collection creation to complete
-                    time.sleep(0.5)
-
-                # Create Edges collection if it doesn't exist
-                if not db.has_collection("Edges"):
-                    db.create_collection("Edges", edge=(self.edge_collection_type == "edge"))
-                    logger.info("Created Edges collection")
-                    # Sleep briefly to allow collection creation to complete
-                    time.sleep(0.5)
-            except CollectionCreateError as e:
-                # Ignore duplicate collection errors
-                if "duplicate" not in str(e).lower():
-                    logger.error(f"Error creating collections: {e}")
-                    raise
-            finally:
-                # Release lock
-                fcntl.flock(f, fcntl.LOCK_UN)
-        except (IOError, OSError) as e:
-            logger.error(f"Error with collection lock file: {e}")
-            raise ArangoError(f"Failed to manage collection lock: {e}") from e
@@ -0,0 +1,404 @@
+"""Shared JSONL scanning and ArangoDB lookups for the missing-node diagnostics."""
+
+import os
+from collections.abc import Container, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING, Any, cast
+
+import orjson
+from arango.client import ArangoClient
+from arango.database import StandardDatabase
+from arango.http import DefaultHTTPClient
+from xxhash import xxh3_64_intdigest
+
+from .log_config import get_logger
+
+if TYPE_CHECKING:
+    from numbers import Number
+
+    from arango.cursor import Cursor
+
+logger = get_logger(__name__)
+
+NodeData = dict[str, dict[str, Any]]
+
+# Nodes are matched on their Neo4j ID, falling back to the plain id field
+NODE_IDS_QUERY = "FOR d IN Nodes LET nid = d.neo4j_id || d.id FILTER nid RETURN nid"
+
+
+@cache
+def get_client(host: str, port: int) -> ArangoClient:
+    """Return the shared client for an ArangoDB server.
+
+    The client is created once per server, so every query made through it
+    reuses the same keep-alive HTTP session instead of reconnecting.
+
+    Args:
+        host: ArangoDB host
+        port: ArangoDB port
+
+    Returns:
+        ArangoDB client
+    """
+    return ArangoClient(
+        hosts=f"http://{host}:{port}",
+        http_client=DefaultHTTPClient(pool_connections=8, pool_maxsize=32),
+    )
+
+
+def connect_db(
+    host: str, port: int, db_name: str, username: str, password: str
+) -> StandardDatabase:
+    """Connect to a database through the shared client for its server."""
+    return get_client(host, port).db(db_name, username=username, password=password)
+
+
+def count_arango_nodes(db: StandardDatabase) -> int:
+    """Count the documents in the Nodes collection.
+
+    LENGTH() of a collection is answered from its metadata, so only the
+    number crosses the wire.
+
+    Args:
+        db: ArangoDB database
+
+    Returns:
+        Number of node documents
+    """
+    cursor = cast("Cursor", db.aql.execute("RETURN LENGTH(Nodes)"))
+    return int(cursor.next())
+
+
+def iter_arango_node_ids(
+    db: StandardDatabase, batch_size: int = 10000
+) -> Iterator[str]:
+    """Stream the Neo4j IDs of every node stored in ArangoDB.
+
+    Only the ID is projected on the server and the cursor is streamed, rather
+    than pulling every full node document over the wire.
+
+    Args:
+        db: ArangoDB database
+        batch_size: Number of IDs fetched per round trip
+
+    Yields:
+        Neo4j node IDs
+    """
+    cursor = cast(
+        "Cursor",
+        db.aql.execute(
+            NODE_IDS_QUERY, batch_size=batch_size, stream=True, ttl=cast("Number", 600)
+        ),
+    )
+    for node_id in cursor:
+        yield str(node_id)
+
+
+def iter_jsonl_lines(
+    file_path: str,
+    start: int = 0,
+    end: int | None = None,
+    chunk_size: int = 1 << 20,
+) -> Iterator[tuple[int, bytes]]:
+    """Yield the raw lines of a JSONL file that begin in [start, end).
+
+    The file is read in large binary chunks and split in C, carrying the
+    partial last line over to the next chunk. A line that straddles
+    ``start`` belongs to the previous range and is skipped, so adjacent
+    ranges cover every line exactly once.
+
+    Args:
+        file_path: Path to the JSONL file
+        start: Byte offset the range starts at
+        end: Byte offset the range ends at (defaults to end of file)
+        chunk_size: Number of bytes to read per chunk
+
+    Yields:
+        Tuples of (byte offset of the line, line bytes without the newline)
+    """
+    with open(file_path, "rb") as f:
+        if start:
+            f.seek(start - 1)
+            f.readline()
+        offset = f.tell()
+        if end is None:
+            end = os.fstat(f.fileno()).st_size
+        tail = b""
+        while offset < end:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                if tail:
+                    yield offset, tail
+                return
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            for line in lines:
+                if offset >= end:
+                    return
+                yield offset, line
+                offset += len(line) + 1
+
+
+def byte_ranges(file_path: str, processes: int | None = None) -> list[tuple[int, int]]:
+    """Split a file into one contiguous byte range per worker process.
+
+    Args:
+        file_path: Path to the file
+        processes: Number of ranges (defaults to the CPU count)
+
+    Returns:
+        List of (start, end) byte offsets covering the whole file
+    """
+    size = os.path.getsize(file_path)
+    step = size // (processes or os.cpu_count() or 1) + 1
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+class HashedIdSet(Container[str]):
+    """Set of string IDs stored as 64-bit xxh3 hashes.
+
+    Holds a fixed-size int per ID instead of the string itself: about 70
+    bytes per entry whatever the ID length, against about 90 for a short
+    numeric ID string in a set and more for longer IDs. Two IDs only
+    collide with probability ~n/2**64, so membership is exact for
+    practical purposes.
+    """
+
+    def __init__(self, ids: Iterable[str] = ()) -> None:
+        self._hashes: set[int] = set()
+        for node_id in ids:
+            self.add(node_id)
+
+    def add(self, node_id: str) -> None:
+        """Add an ID to the set."""
+        self._hashes.add(xxh3_64_intdigest(node_id.encode()))
+
+    def __contains__(self, node_id: object) -> bool:
+        if not isinstance(node_id, str):
+            return False
+        return xxh3_64_intdigest(node_id.encode()) in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+
+@dataclass(slots=True)
+class _ScanFilters:
+    """ID containers that select which nodes a scan worker keeps."""
+
+    exclude: Container[str] | None = None
+    wanted: Container[str] | None = None
+
+
+# Filled in each worker by _init_worker, so the ID containers are pickled
+# once per process rather than once per byte range.
+_filters = _ScanFilters()
+
+
+def _init_worker(exclude: Container[str] | None, wanted: Container[str] | None) -> None:
+    _filters.exclude = exclude
+    _filters.wanted = wanted
+
+
+def _iter_range_nodes(
+    file_path: str, start: int, end: int
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield the ID and record of each node with an ID in one byte range."""
+    for offset, line in iter_jsonl_lines(file_path, start, end):
+        # A node record must contain the literal "node" whatever the spacing
+        # around "type", so edge lines (the bulk of an export) are rejected
+        # by a byte search without being parsed. The type check below stays
+        # authoritative for lines that only mention "node" elsewhere.
+        if b'"node"' not in line:
+            continue
+        try:
+            doc = orjson.loads(line)
+            if doc["type"] != "node":
+                continue
+            node_id = str(doc["id"])
+        except orjson.JSONDecodeError:
+            logger.warning(
+                "Byte %d: Invalid JSON: %s...",
+                offset,
+                line[:100].decode(errors="replace"),
+            )
+            continue
+        except (KeyError, TypeError):
+            # No type, a non-object record, or (for a node) no id
+            node_id = ""
+        if not node_id:
+            if isinstance(doc, dict) and doc.get("type") == "node":
+                logger.warning("Byte %d: Found node without id: %s", offset, doc)
+            continue
+        yield node_id, doc
+
+
+def _scan_range(
+    file_path: str, start: int, end: int, keep_data: bool
+) -> tuple[int, NodeData | set[str]]:
+    """Parse the node records in one byte range of a JSONL file.
+
+    Returns the number of nodes with an ID, plus the selected nodes: their
+    data if ``keep_data`` is set, otherwise just their IDs.
+    """
+    node_count = 0
+    node_data: NodeData = {}
+    node_ids: set[str] = set()
+    exclude = _filters.exclude
+    wanted = _filters.wanted
+
+    for node_id, doc in _iter_range_nodes(file_path, start, end):
+        node_count += 1
+        if exclude is not None and node_id in exclude:
+            continue
+        if wanted is not None and node_id not in wanted:
+            continue
+        if keep_data:
+            node_data[node_id] = doc
+        else:
+            node_ids.add(node_id)
+
+    return node_count, node_data if keep_data else node_ids
+
+
+def _hash_range(file_path: str, start: int, end: int) -> set[int]:
+    """Return the xxh3 hashes of the node IDs in one byte range."""
+    return {
+        xxh3_64_intdigest(node_id.encode())
+        for node_id, _ in _iter_range_nodes(file_path, start, end)
+    }
+
+
+def _scan(
+    file_path: str,
+    keep_data: bool,
+    exclude: Container[str] | None = None,
+    wanted: Container[str] | None = None,
+    processes: int | None = None,
+) -> tuple[int, list[NodeData | set[str]]]:
+    """Run _scan_range over every byte range of a file in a process pool."""
+    node_count = 0
+    parts = []
+
+    ranges = byte_ranges(file_path, processes)
+    with ProcessPoolExecutor(
+        max_workers=len(ranges) or 1,
+        initializer=_init_worker,
+        initargs=(exclude, wanted),
+    ) as pool:
+        futures = [
+            pool.submit(_scan_range, file_path, start, end, keep_data)
+            for start, end in ranges
+        ]
+        for future in futures:
+            count, part = future.result()
+            node_count += count
+            parts.append(part)
+
+    return node_count, parts
+
+
+def scan_jsonl_nodes(
+    file_path: str,
+    exclude: Container[str] | None = None,
+    processes: int | None = None,
+) -> tuple[int, NodeData]:
+    """Scan the node records of a JSONL file in one parallel pass.
+
+    The file is split into one newline-aligned byte range per process and
+    each range is parsed with orjson in its own worker. Passing the IDs
+    already stored in ArangoDB as ``exclude`` keeps only the missing nodes
+    in memory, so both diagnostic scripts get what they need from a single
+    read of the file.
+
+    Args:
+        file_path: Path to the JSONL file
+        exclude: Optional container of node IDs whose data should not be kept
+        processes: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        Tuple containing:
+        - Number of node records with an ID
+        - Dictionary mapping node IDs not in ``exclude`` to their data
+    """
+    node_count, parts = _scan(file_path, True, exclude=exclude, processes=processes)
+    node_data: NodeData = {}
+    for part in parts:
+        node_data.update(cast("NodeData", part))
+    return node_count, node_data
+
+
+def scan_jsonl_node_ids(
+    file_path: str,
+    exclude: Container[str] | None = None,
+    processes: int | None = None,
+) -> tuple[int, set[str]]:
+    """Like scan_jsonl_nodes, but keep only the node IDs.
+
+    Args:
+        file_path: Path to the JSONL file
+        exclude: Optional container of node IDs to leave out
+        processes: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        Tuple containing:
+        - Number of node records with an ID
+        - Set of node IDs not in ``exclude``
+    """
+    node_count, parts = _scan(file_path, False, exclude=exclude, processes=processes)
+    node_ids: set[str] = set()
+    for part in parts:
+        node_ids.update(cast("set[str]", part))
+    return node_count, node_ids
+
+
+def fetch_node_docs(
+    file_path: str,
+    wanted_ids: Container[str],
+    processes: int | None = None,
+) -> NodeData:
+    """Load the data of just the given nodes from a JSONL file.
+
+    Args:
+        file_path: Path to the JSONL file
+        wanted_ids: IDs of the nodes to load
+        processes: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        Dictionary mapping the wanted node IDs found in the file to their data
+    """
+    _, parts = _scan(file_path, True, wanted=wanted_ids, processes=processes)
+    node_data: NodeData = {}
+    for part in parts:
+        node_data.update(cast("NodeData", part))
+    return node_data
+
+
+def count_jsonl_nodes(file_path: str, processes: int | None = None) -> int:
+    """Count the distinct node IDs in a JSONL file.
+
+    A node exported twice is stored once in ArangoDB, so IDs rather than
+    records are counted. Each worker returns a 64-bit hash per ID in its
+    byte range, so the pass holds about 70 bytes per distinct ID, and none
+    of the node records.
+
+    Args:
+        file_path: Path to the JSONL file
+        processes: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        Number of distinct node IDs
+    """
+    id_hashes: set[int] = set()
+    ranges = byte_ranges(file_path, processes)
+    with ProcessPoolExecutor(max_workers=len(ranges) or 1) as pool:
+        for hashes in pool.map(
+            _hash_range,
+            [file_path] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges],
+        ):
+            id_hashes |= hashes
+    return len(id_hashes)
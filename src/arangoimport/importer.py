@@ -20,7 +20,7 @@ from arango.response import Response
 
 from .connection import ArangoConnection
 from .log_config import get_logger, setup_logging
-from .utils import retry_with_backoff
+from .utils import retry_with_backoff, wait_for
 
 logger = get_logger(__name__)
 
@@ -1292,7 +1292,6 @@ def _get_collection_with_retry(
     collection_name: str,
     max_retries: int = 3,
     retry_delay: float = 1.0,
-    initial_delay: float = 1.0
 ) -> Collection:
     """Get a collection with retry logic.
 
@@ -1312,9 +1311,6 @@ def _get_collection_with_retry(
     retry_count = 0
     last_error = None
 
-    # Add initial delay to ensure collection is ready
-    time.sleep(initial_delay)
-
     while retry_count < max_retries:
         try:
             # First check if collection exists
@@ -1327,7 +1323,10 @@ def _get_collection_with_retry(
                     db.create_collection(collection_name, edge=True)
                 else:
                     db.create_collection(collection_name)
-                time.sleep(retry_delay)  # Wait for collection to be ready
+                # Wait only as long as the collection takes to show up
+                wait_for(
+                    lambda: db.has_collection(collection_name), max_wait=retry_delay
+                )
             collection = db.collection(collection_name)
 
             if collection is None:
@@ -1457,11 +1456,15 @@ def process_chunk(
                     raise ValueError(f"Cannot access database {db_config['db_name']}: {e}")
                     
                 # Get collections with increased retry parameters
-                nodes_col = _get_collection_with_retry(db, "Nodes", max_retries=5, retry_delay=retry_delay, initial_delay=retry_delay)
+                nodes_col = _get_collection_with_retry(
+                    db, "Nodes", max_retries=5, retry_delay=retry_delay
+                )
                 if nodes_col is None:
                     raise ValueError("Failed to get Nodes collection")
                     
-                edges_col = _get_collection_with_retry(db, "Edges", max_retries=5, retry_delay=retry_delay, initial_delay=retry_delay)
+                edges_col = _get_collection_with_retry(
+                    db, "Edges", max_retries=5, retry_delay=retry_delay
+                )
                 if edges_col is None:
                     raise ValueError("Failed to get Edges collection")
                 
@@ -1756,7 +1759,7 @@ def clear_existing_edges(edges_col: Collection) -> None:
 def parallel_load_data(
     filename: str | Path,
     db_config: dict[str, Any],
-    processes: int = 16,
+    processes: int | None = None,
     progress_queue: queue.Queue[tuple[int, int]] | None = None,
     import_config: Optional[ImportConfig] = None,
     log_level_str: str = 'WARNING',  # Add log_level_str parameter
@@ -1766,7 +1769,8 @@ def parallel_load_data(
     Args:
         filename: Path to input file
         db_config: Database configuration
-        processes: Number of processes to use
+        processes: Number of processes to use (defaults to one less than the
+            CPU count, leaving a core for the main process)
         progress_queue: Queue to report progress
         import_config: Optional configuration for import settings and validation
         log_level_str: The logging level string for this worker process
@@ -1774,6 +1778,7 @@ def parallel_load_data(
     Returns:
         tuple[int, int]: Number of nodes and edges added
     """
+    processes = processes or max(1, (os.cpu_count() or 2) - 1)
     logger.info(f"Main ({os.getpid()}): Starting parallel_load_data with {processes} processes for {filename}")
 
     # Initialize monitoring and create collections
@@ -1804,7 +1809,6 @@ def parallel_load_data(
         if db_config['db_name'] not in databases:
             logger.info(f"Creating database: {db_config['db_name']}")
             sys_db.create_database(db_config['db_name'])
-            time.sleep(2)  # Wait for database creation
             
             # Verify database was created
             if db_config['db_name'] not in sys_db.databases():
@@ -1823,7 +1827,6 @@ def parallel_load_data(
             if "Nodes" not in collections:
                 logger.info("Creating Nodes collection...")
                 db.create_collection("Nodes")
-                time.sleep(2)  # Wait for collection creation to complete
                 
                 # Verify Nodes collection
                 nodes_col = db.collection("Nodes")
@@ -1836,7 +1839,6 @@ def parallel_load_data(
             if "Edges" not in collections:
                 logger.info("Creating Edges collection...")
                 db.create_collection("Edges", edge=True)
-                time.sleep(2)  # Wait for collection creation to complete
                 
                 # Verify Edges collection
                 edges_col = db.collection("Edges")
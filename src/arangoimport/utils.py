@@ -1,5 +1,6 @@
 """Utility functions for arangoimport."""
 
+import random
 import time
 from collections.abc import Callable
 from pathlib import Path
@@ -79,6 +80,39 @@ def retry_with_backoff(
     return decorator
 
 
+def wait_for(
+    predicate: Callable[[], object],
+    max_wait: float = 2.0,
+    initial_wait: float = 0.01,
+    max_interval: float = 0.5,
+    backoff_factor: float = 1.6,
+) -> bool:
+    """Poll until a condition holds, with jittered exponential backoff.
+
+    Each wait is scaled by a random factor in [0.5, 1.5), so processes that
+    start waiting together do not all poll the server at the same moments.
+
+    Args:
+        predicate: Callable returning a truthy value once the condition holds
+        max_wait: Maximum total time to wait in seconds
+        initial_wait: First wait between polls in seconds
+        max_interval: Maximum wait between polls in seconds
+        backoff_factor: Factor to multiply the wait by after each poll
+
+    Returns:
+        bool: True if the condition held within max_wait, False otherwise
+    """
+    deadline = time.monotonic() + max_wait
+    wait = initial_wait
+    while not predicate():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(wait * (0.5 + random.random()), max_interval, remaining))
+        wait *= backoff_factor
+    return True
+
+
 def get_available_memory() -> int:
     """Get available system memory in bytes using MEMORY_USAGE_FRACTION.
 
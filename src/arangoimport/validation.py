@@ -43,8 +43,7 @@ def validate_node_document(
         
     # Validate required fields
     if type_config:
-        for field in type_config.required_fields:
-            parts = field.split(".")
+        for field, parts in type_config.required_paths:
             value = doc
             for part in parts:
                 value = value.get(part, {}) if isinstance(value, dict) else None
@@ -53,7 +52,7 @@ def validate_node_document(
                     
         # Validate property types
         properties = doc.get("properties", {})
-        for prop, expected_type in type_config.property_types.items():
+        for prop, expected_type in type_config.typed_properties:
             if prop in properties:
                 value = properties[prop]
                 if not isinstance(value, expected_type):
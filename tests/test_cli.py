@@ -3,12 +3,22 @@
 import json
 import os
 import tempfile
-from unittest.mock import patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
+from arango.cursor import Cursor
+from arango.exceptions import AQLQueryExecuteError
 from click.testing import CliRunner
 
-from arangoimport.cli import cli
+from arangoimport.cli import (
+    _MIN_BYTES_PER_PROCESS,
+    _build_conn_url,
+    _get_client,
+    _parse_host,
+    _resolve_processes,
+    cli,
+)
+from arangoimport.connection import ArangoConnection
 
 # Constants for test values
 DEFAULT_PROCESSES = 4
@@ -22,6 +32,13 @@ EXPECTED_NODES = 2
 EXPECTED_EDGES = 1
 
 
+
+def _cursor(items):
+    """Return a mock AQL cursor over the given items."""
+    cursor = MagicMock(spec=Cursor)
+    cursor.__iter__.return_value = iter(items)
+    return cursor
+
 @pytest.fixture
 def sample_data():
     """Create sample data for testing."""
@@ -57,6 +74,14 @@ def runner():
     return CliRunner()
 
 
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    """Drop cached ArangoDB clients so each test sees its own mock."""
+    _get_client.cache_clear()
+    yield
+    _get_client.cache_clear()
+
+
 def test_cli_version(runner):
     """Test CLI version command."""
     result = runner.invoke(cli, ["--version"])
@@ -71,7 +96,7 @@ def test_cli_help(runner):
     assert "Usage:" in result.output
 
 
-@patch("arangoimport.cli.parallel_load_data")
+@patch("arangoimport.importer.parallel_load_data")
 def test_import_data_command(mock_parallel_load, runner, temp_json_file):
     """Test import data command."""
     # Mock successful import
@@ -158,7 +183,7 @@ def test_import_data_nonexistent_file(runner):
     assert "does not exist" in result.output.lower()
 
 
-@patch("arangoimport.cli.parallel_load_data")
+@patch("arangoimport.importer.parallel_load_data")
 def test_import_data_error_handling(mock_parallel_load, runner, temp_json_file):
     """Test error handling in import data command."""
     # Mock an error during import
@@ -167,3 +192,162 @@ def test_import_data_error_handling(mock_parallel_load, runner, temp_json_file):
     result = runner.invoke(cli, ["import-data", temp_json_file, "--password", "test"])
     assert result.exit_code == 1
     assert "Unexpected error: Test error" in result.output
+
+
+@pytest.mark.parametrize(
+    ("extra_args", "expected_output"),
+    [
+        ([], json.dumps([{"_key": "1", "name": "[red]a[/red]"}, 2], indent=2) + "\n"),
+        (["--jsonl"], '{"_key":"1","name":"[red]a[/red]"}\n2\n'),
+    ],
+)
+@patch("arango.client.ArangoClient")
+def test_query_db_streams_results(mock_client, runner, extra_args, expected_output):
+    """Test that query results are written as they come off the cursor."""
+    db = mock_client.return_value.db.return_value
+    db.has_database.return_value = True
+    db.aql.execute.return_value = _cursor([{"_key": "1", "name": "[red]a[/red]"}, 2])
+
+    args = ["query-db", "--query", "FOR d IN Nodes RETURN d", *extra_args]
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 0
+    assert result.output == expected_output
+
+
+@patch("arango.client.ArangoClient")
+def test_query_db_empty_result(mock_client, runner):
+    """Test that an empty result is still a valid JSON array."""
+    db = mock_client.return_value.db.return_value
+    db.has_database.return_value = True
+    db.aql.execute.return_value = _cursor([])
+
+    result = runner.invoke(cli, ["query-db", "--query", "RETURN []"])
+    assert result.exit_code == 0
+    assert json.loads(result.output) == []
+
+
+@pytest.mark.parametrize(
+    ("requested", "file_size", "expected"),
+    [
+        (8, 0, 1),
+        (8, _MIN_BYTES_PER_PROCESS - 1, 1),
+        (8, 3 * _MIN_BYTES_PER_PROCESS + 1, 4),
+        (8, 100 * _MIN_BYTES_PER_PROCESS, 8),
+        (1, 100 * _MIN_BYTES_PER_PROCESS, 1),
+    ],
+)
+def test_resolve_processes(requested, file_size, expected):
+    """Test that small inputs are not split across more workers than they need."""
+    assert _resolve_processes(requested, file_size) == expected
+
+
+def test_resolve_processes_default():
+    """Test that the default leaves a core free for the main process."""
+    processes = _resolve_processes(None, 1000 * _MIN_BYTES_PER_PROCESS)
+    assert processes == max(1, (os.cpu_count() or 1) - 1)
+
+
+@pytest.mark.parametrize(
+    ("host", "expected"),
+    [
+        ("localhost", ("localhost", DEFAULT_PORT)),
+        ("db.example:8530", ("db.example", 8530)),
+        ("http://db.example:8531", ("db.example", 8531)),
+        ("[::1]:8532", ("::1", 8532)),
+        ("[::1]", ("::1", DEFAULT_PORT)),
+    ],
+)
+def test_parse_host(host, expected):
+    """Test splitting --host values into host name and port."""
+    assert _parse_host(host, DEFAULT_PORT) == expected
+
+
+@pytest.mark.parametrize("host", ["localhost:abc", "ftp://localhost"])
+def test_parse_host_invalid(host):
+    """Test that bad ports and schemes are rejected."""
+    with pytest.raises(ValueError):
+        _parse_host(host, DEFAULT_PORT)
+
+
+def test_build_conn_url():
+    """Test that IPv6 addresses are bracketed in the server URL."""
+    assert _build_conn_url("localhost", DEFAULT_PORT) == "http://localhost:8529"
+    assert _build_conn_url("::1", DEFAULT_PORT) == "http://[::1]:8529"
+
+
+@patch("arangoimport.connection.ArangoConnection._init_pool")
+@patch("arangoimport.connection.ArangoClient")
+@patch("arangoimport.importer.parallel_load_data")
+def test_import_data_ipv6_host(
+    mock_parallel_load, mock_client, _mock_init_pool, runner, temp_json_file
+):
+    """Test that an [ipv6]:port host reaches the connection unchanged."""
+    connections = []
+
+    def load(file_path, db_config, **kwargs):
+        connections.append(
+            ArangoConnection(
+                host=db_config["host"],
+                port=db_config["port"],
+                username=db_config["username"],
+                password=db_config["password"],
+                db_name=db_config["db_name"],
+            )
+        )
+        return EXPECTED_NODES, EXPECTED_EDGES
+
+    mock_parallel_load.side_effect = load
+    result = runner.invoke(
+        cli, ["import-data", temp_json_file, "--password", "pw", "--host", "[::1]:8532"]
+    )
+    assert result.exit_code == 0, result.output
+    assert (connections[0].host, connections[0].port) == ("::1", 8532)
+    assert mock_client.call_args.kwargs["hosts"] == "http://[::1]:8532"
+
+
+@patch("arango.client.ArangoClient")
+def test_query_db_server_error(mock_client, runner):
+    """Test that a failed query reports the HTTP status and ArangoDB message."""
+    response = Mock(
+        status_code=400,
+        status_text="Bad Request",
+        error_message="syntax error",
+        error_code=1501,
+    )
+    db = mock_client.return_value.db.return_value
+    db.has_database.return_value = True
+    db.aql.execute.side_effect = AQLQueryExecuteError(response, Mock())
+
+    result = runner.invoke(cli, ["query-db", "--query", "RETURN"])
+    assert result.exit_code == 1
+    assert "ArangoDB query error: 400 Bad Request - syntax error" in result.output
+
+
+@pytest.mark.parametrize(
+    ("deleted", "message"),
+    [(True, "dropped successfully"), (False, "not found. Nothing to drop")],
+)
+@patch("arango.client.ArangoClient")
+def test_drop_db(mock_client, runner, deleted, message):
+    """Test that drop-db deletes in a single request, missing or not."""
+    sys_db = mock_client.return_value.db.return_value
+    sys_db.delete_database.return_value = deleted
+
+    result = runner.invoke(cli, ["drop-db", "old_db", "--yes"])
+    assert result.exit_code == 0
+    assert message in result.output
+    sys_db.delete_database.assert_called_once_with("old_db", ignore_missing=True)
+    sys_db.has_database.assert_not_called()
+
+
+@patch("arango.client.ArangoClient")
+def test_commands_share_client(mock_client, runner):
+    """Test that commands against the same server reuse one client."""
+    db = mock_client.return_value.db.return_value
+    db.has_database.return_value = True
+    db.aql.execute.return_value = _cursor([])
+    db.delete_database.return_value = True
+
+    runner.invoke(cli, ["query-db", "--query", "RETURN 1"])
+    runner.invoke(cli, ["drop-db", "old_db", "--yes"])
+    mock_client.assert_called_once_with(hosts="http://localhost:8529")
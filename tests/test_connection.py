@@ -1,21 +1,28 @@
 """Tests for ArangoDB connection management."""
 
 import logging
+import socket
 from queue import Empty
 from typing import Any, ClassVar
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 import urllib3
-from arango.exceptions import ArangoServerError, IndexDeleteError
+from arango.errno import DUPLICATE_NAME
+from arango.exceptions import (
+    ArangoServerError,
+    CollectionCreateError,
+    DatabaseCreateError,
+    IndexDeleteError,
+)
 
 from arangoimport.connection import (
     EDGE_COLLECTION_TYPE_ID,
     ArangoConnection,
     ArangoError,
-    ensure_collections,
 )
-from arangoimport.logging import get_logger
+from arangoimport.importer import ensure_collections
+from arangoimport.log_config import get_logger
 
 logger = get_logger(__name__)
 
@@ -26,9 +33,26 @@ DEFAULT_USERNAME = "root"
 DEFAULT_PASSWORD = "yourpassword"
 
 
+def _server_available() -> bool:
+    """Return whether an ArangoDB server is listening on the test port."""
+    try:
+        with socket.create_connection((DEFAULT_HOST, DEFAULT_PORT), timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+requires_server = pytest.mark.skipif(
+    not _server_available(),
+    reason=f"no ArangoDB server on {DEFAULT_HOST}:{DEFAULT_PORT}",
+)
+
+
 @pytest.fixture
 def arango_connection():
     """Create a test ArangoDB connection."""
+    if not _server_available():
+        pytest.skip(f"no ArangoDB server on {DEFAULT_HOST}:{DEFAULT_PORT}")
     connection = ArangoConnection(
         host=DEFAULT_HOST,
         port=DEFAULT_PORT,
@@ -65,6 +89,7 @@ def test_db(arango_connection):
         sys_db.delete_database(test_db_name)
 
 
+@requires_server
 def test_connection_init():
     """Test connection initialization."""
     connection = ArangoConnection(
@@ -277,6 +302,51 @@ def test_create_database_duplicate(arango_connection):
         sys_db.delete_database(test_db_name)
 
 
+def _duplicate_name_error(error_type):
+    """Return the error the server gives for a name that is already taken."""
+    response = Mock(error_code=DUPLICATE_NAME, error_message="duplicate name")
+    return error_type(response, Mock())
+
+
+def test_create_database_created_elsewhere():
+    """Test that a duplicate-name error from the server counts as created."""
+    with patch("arangoimport.connection.ArangoClient") as mock_client:
+        connection = ArangoConnection(db_name="test_duplicate_db")
+    sys_db = mock_client.return_value.db.return_value
+    sys_db.create_database.side_effect = _duplicate_name_error(DatabaseCreateError)
+
+    connection.create_database("other_db")
+    assert "other_db" in connection._known_databases
+
+
+def test_ensure_collections_created_elsewhere():
+    """Test that collections another process created first are accepted."""
+    with patch("arangoimport.connection.ArangoClient"):
+        connection = ArangoConnection(db_name="test_duplicate_collections")
+    db = MagicMock()
+    db.collections.return_value = []
+    db.create_collection.side_effect = _duplicate_name_error(CollectionCreateError)
+
+    connection.ensure_collections(db)
+    created = [c.args[0] for c in db.create_collection.call_args_list]
+    assert created == ["Nodes", "Edges"]
+    assert db.name in connection._ensured_collections
+
+
+def test_ensure_collections_other_error_raises():
+    """Test that a create error other than a duplicate name is raised."""
+    with patch("arangoimport.connection.ArangoClient"):
+        connection = ArangoConnection(db_name="test_duplicate_collections")
+    db = MagicMock()
+    db.collections.return_value = []
+    db.create_collection.side_effect = CollectionCreateError(
+        Mock(error_code=1208, error_message="illegal name"), Mock()
+    )
+
+    with pytest.raises(CollectionCreateError):
+        connection.ensure_collections(db)
+
+
 def test_connection_pool_exhaustion(arango_connection, test_db):
     """Test behavior when connection pool is exhausted."""
     connections = []
@@ -471,10 +541,11 @@ def test_get_connection_pool_full(arango_connection):
         while not arango_connection.pool.empty():
             arango_connection.pool.get_nowait()
 
-        # Pool is empty, next get should raise an exception
-        with pytest.raises(Exception) as exc_info:
+        # Pool is empty and at capacity, so the next get times out
+        arango_connection.retry_delay = 0.01
+        with pytest.raises(ArangoError) as exc_info:
             arango_connection._get_connection()
-        assert "Connection pool is empty" in str(exc_info.value)
+        assert "Connection pool timeout" in str(exc_info.value)
     finally:
         # Clean up
         for _ in connections:
@@ -513,13 +584,15 @@ def test_rebuild_collection_indexes_error(test_db, monkeypatch):
 
     # Store original indexes
     arango_connection.disabled_indexes = {
-        "test_collection": [
-            {
-                "id": "idx_1",
-                "type": "hash",
-                "fields": ["test_field"],
-            }
-        ]
+        collection.db_name: {
+            "test_collection": [
+                {
+                    "id": "idx_1",
+                    "type": "hash",
+                    "fields": ["test_field"],
+                }
+            ]
+        }
     }
 
     # Try to rebuild indexes - should raise ArangoError
@@ -0,0 +1,87 @@
+"""Test the connection pool against a mocked ArangoDB client."""
+
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from arangoimport.connection import ArangoConnection, ArangoError
+
+
+@pytest.fixture
+def connection():
+    """Create a two-connection pool whose client hands out distinct mocks."""
+    with patch("arangoimport.connection.ArangoClient") as mock_client:
+        mock_client.return_value.db.side_effect = lambda *args, **kwargs: Mock()
+        yield ArangoConnection(db_name="test_pool", pool_size=2)
+
+
+def _in_thread(func):
+    """Run a function in a new thread and return its result."""
+    results = []
+    thread = threading.Thread(target=lambda: results.append(func()))
+    thread.start()
+    thread.join()
+    return results[0]
+
+
+def test_thread_keeps_its_connection(connection):
+    """Test that a thread reuses its first connection without the pool."""
+    with connection.get_connection() as first:
+        pass
+    with connection.get_connection() as second:
+        assert second is first
+    assert connection.pool.qsize() == 0
+    assert connection._thread_connections == {threading.current_thread(): first}
+
+    connection.release_thread_connection()
+    assert connection._thread_connections == {}
+    assert connection.pool.get_nowait() is first
+
+
+def test_one_connection_stays_in_circulation(connection):
+    """Test that threads beyond pool_size - 1 borrow and return a connection."""
+    with connection.get_connection() as kept:
+        pass
+
+    def borrow():
+        with connection.get_connection() as borrowed:
+            assert connection.pool.qsize() == 0
+        return borrowed
+
+    borrowed = _in_thread(borrow)
+    assert borrowed is not kept
+    assert connection.pool.get_nowait() is borrowed
+
+
+def test_get_connection_waits_for_returned_connection(connection):
+    """Test that a caller at capacity gets the next connection put back."""
+    borrowed = [connection._get_connection(), connection._get_connection()]
+    timer = threading.Timer(0.05, connection.pool.put, args=(borrowed[0],))
+    timer.start()
+    assert connection._get_connection() is borrowed[0]
+    timer.join()
+    assert connection.connections_created == connection.pool_size
+
+
+def test_get_connection_pool_timeout(connection):
+    """Test that a caller at capacity fails once nothing is returned in time."""
+    connection.retry_delay = 0.01
+    connection._get_connection()
+    connection._get_connection()
+    with pytest.raises(ArangoError, match="Connection pool timeout"):
+        connection._get_connection()
+
+
+def test_dead_thread_connection_is_reclaimed(connection):
+    """Test that a connection kept by an exited thread goes back to the pool."""
+
+    def keep():
+        with connection.get_connection() as kept:
+            return kept
+
+    dead_threads_connection = _in_thread(keep)
+    with connection.get_connection() as mine:
+        assert mine is not dead_threads_connection
+    assert connection._thread_connections == {threading.current_thread(): mine}
+    assert connection.pool.get_nowait() is dead_threads_connection
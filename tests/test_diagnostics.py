@@ -0,0 +1,163 @@
+"""Test the shared JSONL scan used by the diagnostic scripts."""
+
+import json
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from arango.cursor import Cursor
+
+from arangoimport.diagnostics import (
+    NODE_IDS_QUERY,
+    HashedIdSet,
+    byte_ranges,
+    count_arango_nodes,
+    count_jsonl_nodes,
+    fetch_node_docs,
+    get_client,
+    iter_arango_node_ids,
+    iter_jsonl_lines,
+    scan_jsonl_node_ids,
+    scan_jsonl_nodes,
+)
+
+TEST_NODES = 50
+
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    """Create a JSONL file mixing nodes, edges and a bad line."""
+    path = tmp_path / "graph.jsonl"
+    with open(path, "w") as f:
+        for i in range(TEST_NODES):
+            f.write(json.dumps({"type": "node", "id": str(i), "labels": ["A"]}) + "\n")
+            f.write(json.dumps({"type": "relationship", "id": f"r{i}"}) + "\n")
+        f.write("not json\n")
+        f.write(json.dumps({"type": "node", "labels": ["B"]}))  # no id, no newline
+    return path
+
+
+@pytest.fixture
+def duplicate_jsonl_file(tmp_path):
+    """Create a JSONL file whose first node is exported again at the end."""
+    path = tmp_path / "duplicates.jsonl"
+    with open(path, "w") as f:
+        for i in range(TEST_NODES):
+            f.write(json.dumps({"type": "node", "id": str(i)}) + "\n")
+        f.write(json.dumps({"type": "node", "id": "0"}) + "\n")
+    return path
+
+
+@pytest.mark.parametrize("processes", [1, 3, 7])
+def test_byte_ranges_cover_every_line_once(jsonl_file, processes):
+    """Test that adjacent byte ranges yield each line exactly once."""
+    expected = list(iter_jsonl_lines(str(jsonl_file)))
+    ranged = [
+        item
+        for start, end in byte_ranges(str(jsonl_file), processes)
+        for item in iter_jsonl_lines(str(jsonl_file), start, end, chunk_size=17)
+    ]
+    assert ranged == expected
+    assert [line for _, line in expected] == jsonl_file.read_bytes().split(b"\n")
+
+
+@pytest.mark.parametrize("processes", [1, 4])
+def test_scan_jsonl_nodes(jsonl_file, processes):
+    """Test that only nodes with an ID are counted and kept."""
+    node_count, node_data = scan_jsonl_nodes(str(jsonl_file), processes=processes)
+    assert node_count == TEST_NODES
+    assert set(node_data) == {str(i) for i in range(TEST_NODES)}
+    assert node_data["7"]["labels"] == ["A"]
+
+
+def test_scan_jsonl_nodes_exclude(jsonl_file):
+    """Test that excluded IDs are counted but their data is dropped."""
+    node_count, node_data = scan_jsonl_nodes(
+        str(jsonl_file), exclude={str(i) for i in range(10)}, processes=2
+    )
+    assert node_count == TEST_NODES
+    assert set(node_data) == {str(i) for i in range(10, TEST_NODES)}
+
+
+def test_scan_jsonl_node_ids(jsonl_file):
+    """Test that the ID-only scan matches the keys of the full scan."""
+    node_count, node_ids = scan_jsonl_node_ids(
+        str(jsonl_file), exclude={"0", "1"}, processes=3
+    )
+    assert node_count == TEST_NODES
+    assert node_ids == {str(i) for i in range(2, TEST_NODES)}
+
+
+def test_fetch_node_docs(jsonl_file):
+    """Test loading the data of selected nodes only."""
+    node_data = fetch_node_docs(str(jsonl_file), {"3", "42", "missing"}, processes=3)
+    assert set(node_data) == {"3", "42"}
+    assert node_data["42"]["id"] == "42"
+
+
+def test_scan_empty_file(tmp_path):
+    """Test scanning an empty file."""
+    path = tmp_path / "empty.jsonl"
+    path.touch()
+    assert scan_jsonl_nodes(str(path)) == (0, {})
+
+
+def test_hashed_id_set():
+    """Test membership of a hashed ID set."""
+    ids = HashedIdSet(str(i) for i in range(TEST_NODES))
+    ids.add("Compound:inchikey/ABC")
+    assert len(ids) == TEST_NODES + 1
+    assert "7" in ids
+    assert "Compound:inchikey/ABC" in ids
+    assert str(TEST_NODES) not in ids
+    # Only strings are members, even when their text matches
+    assert int("7") not in ids
+
+
+def test_scan_jsonl_nodes_hashed_exclude(jsonl_file):
+    """Test excluding nodes with a hashed ID set."""
+    exclude = HashedIdSet(str(i) for i in range(TEST_NODES - 5))
+    _, node_data = scan_jsonl_nodes(str(jsonl_file), exclude=exclude, processes=2)
+    assert set(node_data) == {str(i) for i in range(TEST_NODES - 5, TEST_NODES)}
+
+
+def test_get_client_is_shared():
+    """Test that one client is reused per server."""
+    assert get_client("localhost", 8529) is get_client("localhost", 8529)
+    assert get_client("localhost", 8529) is not get_client("localhost", 8530)
+
+
+def test_iter_arango_node_ids():
+    """Test streaming node IDs from a projected AQL cursor."""
+    db = Mock()
+    cursor = MagicMock(spec=Cursor)
+    cursor.__iter__.return_value = iter(["1", 2])
+    db.aql.execute.return_value = cursor
+    assert list(iter_arango_node_ids(db)) == ["1", "2"]
+    args, kwargs = db.aql.execute.call_args
+    assert args == (NODE_IDS_QUERY,)
+    assert kwargs["stream"] is True
+
+
+def test_count_jsonl_nodes(jsonl_file):
+    """Test counting nodes without keeping any of them."""
+    assert count_jsonl_nodes(str(jsonl_file), processes=3) == TEST_NODES
+
+
+@pytest.mark.parametrize("processes", [1, 3])
+def test_count_jsonl_nodes_duplicate_id(duplicate_jsonl_file, processes):
+    """Test that a node exported twice is counted once, even across ranges."""
+    path = str(duplicate_jsonl_file)
+    assert count_jsonl_nodes(path, processes=processes) == TEST_NODES
+    # The scans count records, and only the count pass counts IDs
+    node_count, node_ids = scan_jsonl_node_ids(path, processes=processes)
+    assert node_count == TEST_NODES + 1
+    assert len(node_ids) == TEST_NODES
+
+
+def test_count_arango_nodes():
+    """Test counting nodes from collection metadata."""
+    db = Mock()
+    db.aql.execute.return_value = Mock(spec=Cursor)
+    db.aql.execute.return_value.next.return_value = TEST_NODES
+    assert count_arango_nodes(db) == TEST_NODES
+    db.aql.execute.assert_called_once_with("RETURN LENGTH(Nodes)")
@@ -1,12 +1,14 @@
 """Test import configuration and result handling."""
 
+import pickle
 from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
 from arango.collection import Collection
 
-from arangoimport.config import ImportConfig
+from arangoimport import config as config_module
+from arangoimport.config import ImportConfig, NodeTypeConfig, get_default_configs
 from arangoimport.importer import ImportResult, batch_save_documents, _handle_import_bulk_result
 
 
@@ -44,6 +46,28 @@ def test_import_config_custom_values() -> None:
     assert config.dedup_enabled is False
 
 
+def test_import_config_error_cap() -> None:
+    """Test that only the first error_cap error messages are kept."""
+    errors = [f"Error {i}" for i in range(10)]
+    config = ImportConfig(error_cap=3)
+    for error in errors:
+        config.track_error(error)
+
+    metrics = config.get_metrics().to_dict()
+    assert metrics["validation_errors"] == errors[:3]
+    assert metrics["invalid_documents"] == len(errors)
+
+
+@pytest.mark.parametrize("exact_dedup", [False, True])
+def test_import_config_is_duplicate(exact_dedup: bool) -> None:
+    """Test duplicate detection with hashed and exact keys."""
+    config = ImportConfig(exact_dedup=exact_dedup)
+    assert config.is_duplicate("Gene/1", "Gene") is False
+    assert config.is_duplicate("Gene/2", "Gene") is False
+    assert config.is_duplicate("Gene/1", "Gene") is True
+    assert config.get_metrics().duplicates_found == 1
+
+
 def test_handle_import_bulk_result_success() -> None:
     """Test successful import result handling."""
     result = {
@@ -167,3 +191,51 @@ def test_batch_save_documents_duplicate_strategies(
         complete=True,
         details=True
     )
+
+
+def test_get_default_configs() -> None:
+    """Test that the default node type configs are built once and shared."""
+    configs = get_default_configs()
+    assert set(configs) == {"Gene", "Protein", "Compound"}
+    assert get_default_configs() is configs
+    assert config_module.DEFAULT_CONFIGS is configs
+
+
+def test_quality_metrics_type_stats() -> None:
+    """Test that every type reports all of its stats, counted or not."""
+    config = ImportConfig()
+    config.track_document({"type": "node"}, True)
+    config.track_duplicate("1", "node")
+    assert config.get_metrics().to_dict()["type_stats"] == {
+        "node": {"total": 1, "valid": 1, "invalid": 0, "duplicates": 1}
+    }
+
+
+def test_import_config_pickle_round_trip() -> None:
+    """Test that a slotted config survives the hand-off to worker processes."""
+    config = ImportConfig(on_duplicate="update")
+    config.track_document({"type": "node"}, True)
+    config.is_duplicate("1", "node")
+
+    restored = pickle.loads(pickle.dumps(config))
+    assert not hasattr(restored, "__dict__")
+    assert restored.on_duplicate == "update"
+    assert restored.get_metrics().to_dict() == config.get_metrics().to_dict()
+    assert restored.is_duplicate("1", "node")
+
+
+def test_node_type_config_compiled_fields() -> None:
+    """Test that required paths and property types are compiled up front."""
+    type_config = NodeTypeConfig(
+        required_fields=["id", "properties.name"],
+        unique_fields=[],
+        property_types={"name": str},
+        transform_rules={},
+        dedup_fields=[],
+    )
+    assert type_config.required_paths == (
+        ("id", ("id",)),
+        ("properties.name", ("properties", "name")),
+    )
+    assert type_config.typed_properties == (("name", str),)
+    assert get_default_configs()["Compound"].typed_properties[0] == ("name", str)
@@ -0,0 +1,230 @@
+"""Test disabling and rebuilding indexes against a mocked ArangoDB client."""
+
+import os
+import stat
+from unittest.mock import Mock, call, patch
+
+import pytest
+from arango.database import StandardDatabase
+from arango.exceptions import IndexDeleteError
+from arango.job import AsyncJob
+
+from arangoimport.connection import ArangoConnection, ArangoError, _job_result
+
+PERSISTENT_INDEX = {
+    "id": "Nodes/10",
+    "type": "persistent",
+    "fields": ["name"],
+    "unique": False,
+    "sparse": True,
+    "figures": {"memory": 1024},
+}
+HASH_INDEX = {"id": "Nodes/11", "type": "hash", "fields": ["neo4j_id"], "unique": True}
+
+
+def _job(result=None, error=None):
+    """Return a finished mock AsyncJob."""
+    job = Mock(spec=AsyncJob)
+    job.status.return_value = "done"
+    if error is not None:
+        job.result.side_effect = error
+    else:
+        job.result.return_value = result
+    return job
+
+
+def _connect():
+    """Create a connection whose ArangoDB client is a mock."""
+    with patch("arangoimport.connection.ArangoClient"):
+        return ArangoConnection(db_name="test_index_management")
+
+
+@pytest.fixture(autouse=True)
+def disabled_indexes_file(tmp_path, monkeypatch):
+    """Keep the state directory under the test's temporary directory."""
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path))
+    return str(
+        tmp_path
+        / "arangoimport"
+        / "disabled_indexes_localhost%3A8529%3Atest_index_management.json"
+    )
+
+
+@pytest.fixture
+def connection():
+    """Create a connection whose ArangoDB client is a mock."""
+    return _connect()
+
+
+@pytest.fixture
+def db():
+    """Create a database holding a Nodes collection with two indexes."""
+    db = Mock(spec=StandardDatabase)
+    db.name = "test_index_management"
+    db.collections.return_value = [
+        {"name": "_graphs", "system": True, "type": "document"},
+        {"name": "Nodes", "system": False, "type": "document"},
+    ]
+    collection = db.begin_async_execution.return_value.collection.return_value
+    collection.db_name = db.name
+    collection.name = "Nodes"
+    primary = {"id": "Nodes/0", "type": "primary", "fields": ["_key"]}
+    collection.indexes.return_value = _job([primary, PERSISTENT_INDEX, HASH_INDEX])
+    collection.delete_index.side_effect = lambda index_id: _job(True)
+    collection.add_persistent_index.return_value = _job({"id": "Nodes/20"})
+    collection.add_index.return_value = _job({"id": "Nodes/21"})
+    return db
+
+
+def test_job_result_waits_for_pending_job():
+    """Test that an async job is polled until the server has finished it."""
+    statuses = ["pending", "pending", "done"]
+    job = _job("done")
+    job.status.side_effect = statuses
+    assert _job_result(job) == "done"
+    assert job.status.call_count == len(statuses)
+    assert _job_result([1, 2]) == [1, 2]
+
+
+def test_disable_indexes(connection, db):
+    """Test that every non-primary index is deleted and its definition saved."""
+    connection.manage_indexes(db, disable=True)
+
+    db.begin_async_execution.assert_called_once_with(return_result=True)
+    collection = db.begin_async_execution.return_value.collection.return_value
+    deleted = [c.args[0] for c in collection.delete_index.call_args_list]
+    assert deleted == ["Nodes/10", "Nodes/11"]
+    saved = {k: v for k, v in PERSISTENT_INDEX.items() if k != "figures"}
+    assert connection.disabled_indexes == {db.name: {"Nodes": [saved, HASH_INDEX]}}
+    assert connection._load_disabled_indexes(db.name) == {"Nodes": [saved, HASH_INDEX]}
+
+
+def test_rebuild_indexes(connection, db, disabled_indexes_file):
+    """Test that disabled indexes are rebuilt and the saved state cleared."""
+    connection.manage_indexes(db, disable=True)
+    assert os.path.exists(disabled_indexes_file)
+    connection.manage_indexes(db, disable=False)
+
+    collection = db.begin_async_execution.return_value.collection.return_value
+    collection.add_persistent_index.assert_called_once_with(
+        fields=["name"], unique=False, sparse=True
+    )
+    collection.add_index.assert_called_once_with(
+        {
+            "type": "hash",
+            "fields": ["neo4j_id"],
+            "name": "Nodes_hash_index",
+            "unique": True,
+            "sparse": False,
+        }
+    )
+    assert connection.disabled_indexes == {db.name: {}}
+    assert not os.path.exists(disabled_indexes_file)
+
+
+def test_disable_indexes_one_collection_fails(connection, db):
+    """Test that a failing collection raises ArangoError after the others finish."""
+    nodes = db.begin_async_execution.return_value.collection.return_value
+    edges = Mock()
+    edges.name = "Edges"
+    edges_index = {"id": "Edges/5", "type": "persistent", "fields": ["label"]}
+    edges.indexes.return_value = _job([edges_index])
+    response = Mock(error_code=1212, error_message="index not found")
+    edges.delete_index.return_value = _job(error=IndexDeleteError(response, Mock()))
+    collections = {"Nodes": nodes, "Edges": edges}
+    edges_info = {"name": "Edges", "system": False, "type": "edge"}
+    db.collections.return_value.append(edges_info)
+    db.begin_async_execution.return_value.collection.side_effect = collections.get
+
+    with pytest.raises(ArangoError, match="index not found"):
+        connection.manage_indexes(db, disable=True)
+
+    assert db.begin_async_execution.call_count == len(collections)
+    nodes.delete_index.assert_has_calls([call("Nodes/10"), call("Nodes/11")])
+    assert connection.disabled_indexes[db.name]["Nodes"][0]["id"] == "Nodes/10"
+
+
+def test_disable_rereads_indexes_each_call(connection, db):
+    """Test that indexes added since the last call are disabled too."""
+    connection.manage_indexes(db, disable=True)
+    collection = db.begin_async_execution.return_value.collection.return_value
+    added = {"id": "Nodes/30", "type": "persistent", "fields": ["x"]}
+    collection.indexes.return_value = _job([added])
+    collection.delete_index.reset_mock()
+
+    connection.manage_indexes(db, disable=True)
+    collection.delete_index.assert_called_once_with("Nodes/30")
+    saved = connection._load_disabled_indexes(db.name)["Nodes"]
+    assert [idx["id"] for idx in saved] == ["Nodes/10", "Nodes/11", "Nodes/30"]
+
+
+def test_disable_resumes_after_crash(db):
+    """Test that indexes deleted before a crash are still rebuilt."""
+    collection = db.begin_async_execution.return_value.collection.return_value
+    collection.delete_index.side_effect = lambda index_id: (
+        _job(True) if index_id == "Nodes/10" else _job(error=RuntimeError("crashed"))
+    )
+    with pytest.raises(ArangoError):
+        _connect().manage_indexes(db, disable=True)
+
+    # A new process finds only the index that was not deleted
+    collection.indexes.return_value = _job([HASH_INDEX])
+    collection.delete_index.side_effect = lambda index_id: _job(True)
+    connection = _connect()
+    connection.manage_indexes(db, disable=True)
+    collection.delete_index.assert_called_with("Nodes/11")
+    assert [idx["id"] for idx in connection.disabled_indexes[db.name]["Nodes"]] == [
+        "Nodes/10",
+        "Nodes/11",
+    ]
+
+    connection.manage_indexes(db, disable=False)
+    collection.add_persistent_index.assert_called_once()
+    collection.add_index.assert_called_once()
+
+
+def test_save_keeps_other_processes_entries(connection):
+    """Test that saving one collection keeps entries another process saved."""
+    other = _connect()
+    connection._save_disabled_indexes("test_index_management", "Nodes", [HASH_INDEX])
+    other._save_disabled_indexes("test_index_management", "Edges", [PERSISTENT_INDEX])
+    assert set(connection._load_disabled_indexes("test_index_management")) == {
+        "Nodes",
+        "Edges",
+    }
+
+    other._save_disabled_indexes("test_index_management", "Edges", None)
+    assert set(connection._load_disabled_indexes("test_index_management")) == {"Nodes"}
+
+
+def test_disabled_indexes_file_is_private_and_per_server(connection, tmp_path):
+    """Test that the saved state is per server and in a user-only directory."""
+    with patch("arangoimport.connection.ArangoClient"):
+        other_server = ArangoConnection(
+            host="db2", port=8530, db_name="test_index_management"
+        )
+    connection._save_disabled_indexes("test_index_management", "Nodes", [HASH_INDEX])
+
+    state_dir = tmp_path / "arangoimport"
+    assert stat.S_IMODE(os.stat(state_dir).st_mode) == stat.S_IRWXU
+    assert connection._load_disabled_indexes("test_index_management") == {
+        "Nodes": [HASH_INDEX]
+    }
+    assert other_server._load_disabled_indexes("test_index_management") == {}
+
+
+def test_disable_merges_inverted_index_by_fields(connection, db):
+    """Test that an inverted index, whose fields are dicts, is saved once."""
+    inverted = {
+        "id": "Nodes/40",
+        "type": "inverted",
+        "fields": [{"name": "label", "analyzer": "text_en"}],
+    }
+    connection._save_disabled_indexes("test_index_management", "Nodes", [inverted])
+    collection = db.begin_async_execution.return_value.collection.return_value
+    # Rebuilt since under a new id
+    collection.indexes.return_value = _job([{**inverted, "id": "Nodes/41"}])
+
+    connection.manage_indexes(db, disable=True)
+    collection.delete_index.assert_called_once_with("Nodes/41")
+    assert connection._load_disabled_indexes(db.name) == {"Nodes": [inverted]}
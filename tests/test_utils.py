@@ -16,12 +16,14 @@ from arangoimport.utils import (
     get_available_memory,
     retry_with_backoff,
     validate_document,
+    wait_for,
 )
 
 # Constants for test values
 MAX_RETRIES = 3
 TEST_CHUNKS = 4
 RETRY_ATTEMPTS = 2
+READY_POLL = 3
 MEMORY_SIZES = [
     (1024 * 1024, 100),  # 1 MB
     (1024 * 1024 * 1024, 1000),  # 1 GB
@@ -62,6 +64,22 @@ def test_retry_with_backoff():
     assert counter == RETRY_ATTEMPTS
 
 
+def test_wait_for():
+    """Test polling until a condition holds."""
+    polls = 0
+
+    def ready_on_third_poll():
+        nonlocal polls
+        polls += 1
+        return polls >= READY_POLL
+
+    assert wait_for(ready_on_third_poll)
+    assert polls == READY_POLL
+
+    # Test giving up once max_wait has passed
+    assert not wait_for(lambda: False, max_wait=0.05)
+
+
 def test_get_available_memory():
     """Test getting available memory."""
     memory = get_available_memory()